@@ -0,0 +1,114 @@
+"""
+Пользователи для аутентификации без обращения к базе.
+
+Поля пользователя (без хэша пароля) и его роль хранятся в общем кэше под
+версией пользователя (core/versions.py) и в LRU процесса с коротким TTL.
+Поэтому запрос с прогретым LRU не стоит ни запросов к базе, ни обращений
+к кэшу. Изменение пользователя или роли переводит пользователя на новую
+версию и убирает его из LRU этого процесса (authentication/signals.py);
+другие процессы увидят изменение не позже чем через USER_LRU_TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.fields.files import FieldFile
+
+from core.versions import bump_versions, get_versions
+from .models import User, UserRole
+
+USER_KEY = 'user:{}:v{}:auth'
+# Хэш пароля не кэшируется: поле остается отложенным и читается из базы по требованию
+EXCLUDED_FIELDS = {'password'}
+
+_local = OrderedDict()  # {user_id: (истекает, данные)}
+_local_lock = threading.Lock()
+
+
+def get_user(user_id):
+    """Пользователь с ролью из LRU, общего кэша или базы; None, если его нет"""
+    # В токене id строкой: ключи LRU должны совпадать с pk из сигналов
+    user_id = User._meta.pk.to_python(user_id)
+    data = _local_get(user_id)
+    if data is None:
+        data = _shared_get(user_id)
+        if data is None:
+            return None
+        _local_set(user_id, data)
+    return _build_user(data)
+
+
+def forget_users(*user_ids):
+    """Сбрасывает закэшированных пользователей после изменения"""
+    bump_versions('user', *user_ids)
+    with _local_lock:
+        for user_id in user_ids:
+            _local.pop(user_id, None)
+
+
+def _shared_get(user_id):
+    cache = caches[settings.USER_CACHE_ALIAS]
+    key = USER_KEY.format(user_id, get_versions('user', [user_id])[user_id])
+
+    data = cache.get(key)
+    if data is None:
+        user = User.objects.select_related('role').filter(pk=user_id).first()
+        if user is None:
+            return None
+        data = _dump_user(user)
+        cache.set(key, data, settings.USER_CACHE_TIMEOUT)
+    return data
+
+
+def _dump_user(user):
+    role = user.role
+    return {
+        'fields': {
+            field.attname: _field_value(user, field)
+            for field in User._meta.concrete_fields if field.attname not in EXCLUDED_FIELDS
+        },
+        'role': None if role is None else {
+            field.attname: _field_value(role, field) for field in UserRole._meta.concrete_fields
+        },
+    }
+
+
+def _field_value(instance, field):
+    value = getattr(instance, field.attname)
+    # FieldFile ссылается на экземпляр модели, в кэш кладем только имя файла
+    return value.name if isinstance(value, FieldFile) else value
+
+
+def _build_user(data):
+    # Новый экземпляр на каждый запрос: данные из LRU общие для потоков
+    fields = data['fields']
+    user = User.from_db(DEFAULT_DB_ALIAS, list(fields), list(fields.values()))
+    role = data['role']
+    if role is not None:
+        role = UserRole.from_db(DEFAULT_DB_ALIAS, list(role), list(role.values()))
+    User._meta.get_field('role').set_cached_value(user, role)
+    return user
+
+
+def _local_get(user_id):
+    with _local_lock:
+        entry = _local.get(user_id)
+        if entry is None:
+            return None
+        expires, data = entry
+        if expires < time.monotonic():
+            del _local[user_id]
+            return None
+        _local.move_to_end(user_id)
+        return data
+
+
+def _local_set(user_id, data):
+    with _local_lock:
+        _local[user_id] = (time.monotonic() + settings.USER_LRU_TTL, data)
+        _local.move_to_end(user_id)
+        while len(_local) > settings.USER_LRU_SIZE:
+            _local.popitem(last=False)
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:43
+
+from django.db import migrations, models
+
+
+def fill_folded(apps, schema_editor, batch_size=1000):
+    User = apps.get_model('authentication', 'User')
+    users = []
+    for user in User.objects.only('id', 'username', 'email').iterator(chunk_size=batch_size):
+        user.username_folded = user.username.casefold()
+        user.email_folded = user.email.casefold()
+        users.append(user)
+        if len(users) == batch_size:
+            User.objects.bulk_update(users, ['username_folded', 'email_folded'])
+            users = []
+    User.objects.bulk_update(users, ['username_folded', 'email_folded'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0008_friendrequest_friendrequest_inbox_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_folded',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='username_folded',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_folded, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['username_folded'], name='user_username_folded_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['email_folded'], name='user_email_folded_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
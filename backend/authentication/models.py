@@ -10,6 +10,13 @@ class User(AbstractBaseUser, PermissionsMixin):
     role = models.ForeignKey('UserRole', on_delete=models.SET_NULL, null=True, default=2, verbose_name="Роль")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
     friends = models.ManyToManyField('User', blank=True, verbose_name="Друзья")
+    # Приведенные к одному регистру копии для индексного поиска по префиксу
+    username_folded = models.CharField(max_length=255, editable=False, default='')
+    email_folded = models.CharField(max_length=255, editable=False, default='')
+
+    # Растет при выходе со всех устройств и смене пароля: токены со старым
+    # поколением (claim gen) недействительны (authentication/revocation.py)
+    token_generation = models.PositiveIntegerField(verbose_name='Поколение токенов', default=0)
 
     is_active = models.BooleanField(verbose_name='Активирован', default=True)
     is_staff = models.BooleanField(verbose_name='Сотрудник', default=False)
@@ -22,10 +29,43 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.email
+
+    def save(self, *args, **kwargs):
+        self.username_folded = self.username.casefold()
+        self.email_folded = self.email.casefold()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'username', 'email'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'username_folded', 'email_folded'}
+        super().save(*args, **kwargs)
     
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+        indexes = [
+            # varchar_pattern_ops нужен PostgreSQL для LIKE 'abc%', другие СУБД его игнорируют
+            models.Index(fields=['username_folded'], name='user_username_folded_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['email_folded'], name='user_email_folded_idx', opclasses=['varchar_pattern_ops']),
+        ]
+
+
+class RevokedToken(models.Model):
+    """Отозванный access-токен (выход с устройства); нужен, пока токен не истек"""
+    jti = models.CharField(verbose_name='Идентификатор токена', max_length=255, unique=True)
+    user = models.ForeignKey(User, verbose_name='Пользователь', on_delete=models.CASCADE, related_name='revoked_tokens')
+    expires_at = models.DateTimeField(verbose_name='Истекает')
+    revoked_at = models.DateTimeField(verbose_name='Отозван', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Отозванный токен'
+        verbose_name_plural = 'Отозванные токены'
+        indexes = [
+            # Догрузка новых отзывов в фильтр процессов и очистка истекших
+            models.Index(fields=['revoked_at'], name='revokedtoken_revoked_idx'),
+            models.Index(fields=['expires_at'], name='revokedtoken_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} — {self.jti}"
 
 
 class UserRole(models.Model):
@@ -74,6 +114,10 @@ class FriendRequest(models.Model):
     class Meta:
         verbose_name = "Запрос в друзья"
         verbose_name_plural = "Запросы в друзья"
+        indexes = [
+            # Входящие запросы пользователя с нужным статусом, новые первыми
+            models.Index(fields=['receiver', 'status', '-created_at'], name='friendrequest_inbox_idx'),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['sender', 'receiver'], 
@@ -0,0 +1,130 @@
+"""
+Отзыв access-токенов без запросов к базе на каждый запрос.
+
+Выход со всех устройств и смена пароля увеличивают User.token_generation:
+токен с поколением (claim gen) меньше текущего недействителен. Поколение
+приходит вместе с пользователем из authentication/cache.py, поэтому эта
+проверка ничего не стоит.
+
+Выход с одного устройства записывает jti токена в RevokedToken. Каждый
+процесс держит отозванные jti в фильтре Блума и догружает новые записи по
+revoked_at не чаще раза в REVOCATION_REFRESH_SECONDS. Фильтр ошибается
+только в сторону «отозван», поэтому положительный ответ подтверждается
+запросом к базе: это отозванные токены и редкие ложные срабатывания.
+Истекшие записи удаляет команда prune_revoked_tokens, а фильтр
+перестраивается без них, когда заполняется.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import forget_users
+from .models import RevokedToken, User
+
+GENERATION_CLAIM = 'gen'
+# Запись, закоммиченная позже соседних, не должна выпасть из догрузки
+REFRESH_OVERLAP = timedelta(minutes=1)
+
+
+class BloomFilter:
+    """Множество строк с ответами «точно нет» и «возможно есть»; удалять нельзя"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def _positions(self, item):
+        # Двойное хэширование: k позиций из двух половин одного дайджеста
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+
+class _RevokedTokens:
+    """Фильтр отозванных jti процесса и момент, с которого догружать новые"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filter = None
+        self.loaded_since = None
+        self.refresh_at = 0.0
+
+    def contains(self, jti):
+        if time.monotonic() >= self.refresh_at:
+            self.refresh()
+        return jti in self.filter
+
+    def add(self, jti):
+        with self.lock:
+            if self.filter is not None:
+                self.filter.add(jti)
+
+    def refresh(self):
+        with self.lock:
+            if time.monotonic() < self.refresh_at:
+                return  # уже обновил другой поток
+            started = timezone.now()
+            if self.filter is None or self.filter.count > self.filter.capacity:
+                self._rebuild(started)
+            else:
+                for jti in RevokedToken.objects.filter(revoked_at__gte=self.loaded_since).values_list('jti', flat=True):
+                    self.filter.add(jti)
+            self.loaded_since = started - REFRESH_OVERLAP
+            self.refresh_at = time.monotonic() + settings.REVOCATION_REFRESH_SECONDS
+
+    def _rebuild(self, now):
+        jtis = list(RevokedToken.objects.filter(expires_at__gt=now).values_list('jti', flat=True))
+        capacity = max(settings.REVOCATION_FILTER_CAPACITY, 2 * len(jtis))
+        self.filter = BloomFilter(capacity, settings.REVOCATION_FILTER_ERROR_RATE)
+        for jti in jtis:
+            self.filter.add(jti)
+
+
+_revoked = _RevokedTokens()
+
+
+def is_revoked(token, user):
+    """Отозван ли проверенный токен пользователя user (из authentication/cache.py)"""
+    if token.get(GENERATION_CLAIM, 0) < user.token_generation:
+        return True
+
+    jti = token.get(api_settings.JTI_CLAIM)
+    if jti is None or not _revoked.contains(jti):
+        return False
+    return RevokedToken.objects.filter(jti=jti).exists()
+
+
+def revoke_token(token):
+    """Выход с устройства; другие процессы узнают не позже чем через REVOCATION_REFRESH_SECONDS"""
+    jti = token[api_settings.JTI_CLAIM]
+    RevokedToken.objects.get_or_create(jti=jti, defaults={
+        'user_id': token[api_settings.USER_ID_CLAIM],
+        'expires_at': datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc),
+    })
+    _revoked.add(jti)
+
+
+def revoke_all(user):
+    """Выход со всех устройств: все выданные пользователю токены недействительны"""
+    User.objects.filter(pk=user.pk).update(token_generation=F('token_generation') + 1)
+    # update() обходит сигналы, кэш пользователя сбрасываем сами
+    forget_users(user.pk)
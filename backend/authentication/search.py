@@ -0,0 +1,45 @@
+"""
+Поиск пользователей по префиксу имени и email для добавления в друзья и проекты.
+
+Ищет по приведенным к одному регистру колонкам username_folded/email_folded
+с индексами, каждая ветка читает не больше limit строк в порядке индекса.
+Выше в выдаче точное совпадение имени, затем совпадения по имени, затем по email.
+"""
+from django.db import connection
+
+from .models import User
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+# Символ больше любого в тексте: [prefix, prefix + MAX_CHAR) — все строки с префиксом
+MAX_CHAR = '\U0010ffff'
+
+
+def prefix_filter(field, prefix):
+    if connection.vendor == 'sqlite':
+        # LIKE в SQLite регистронезависим и не использует обычный индекс, диапазон — использует
+        return {f'{field}__gte': prefix, f'{field}__lt': prefix + MAX_CHAR}
+    return {f'{field}__startswith': prefix}
+
+
+def search_users(query, user, limit=DEFAULT_LIMIT):
+    """Пользователи с именем или email на query, кроме самого user и его друзей"""
+    prefix = query.strip().casefold()
+    if not prefix:
+        return []
+
+    candidates = User.objects.filter(is_active=True).exclude(pk=user.pk).exclude(
+        pk__in=user.friends.values('pk')
+    ).only('id', 'username', 'email', 'photo', 'username_folded')
+
+    by_username = candidates.filter(**prefix_filter('username_folded', prefix)).order_by('username_folded')
+    by_email = candidates.filter(**prefix_filter('email_folded', prefix)).order_by('email_folded')
+
+    ranked = {}
+    for group, users in enumerate((by_username[:limit], by_email[:limit])):
+        for position, found in enumerate(users):
+            exact = group == 0 and found.username_folded == prefix
+            ranked.setdefault(found.pk, ((not exact, group, position), found))
+
+    return [found for _, found in sorted(ranked.values(), key=lambda item: item[0])][:limit]
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from core.serializers import SparseFieldsMixin
+
 from .models import User, UserRole, FriendRequest
 
 
@@ -9,7 +11,7 @@ class UserRoleSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     role = UserRoleSerializer(required=False)
 
@@ -29,6 +31,14 @@ class UserSerializer(serializers.ModelSerializer):
         instance.save()
 
         return instance
+
+
+class UserBriefSerializer(serializers.ModelSerializer):
+    """Пользователь в результатах поиска: без роли и дат"""
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'photo']
+
     
 class FriendRequestSerializer(serializers.ModelSerializer):
     sender = UserSerializer(read_only=True)
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import forget_users
+from .models import User, UserRole
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Профиль из update-profile, правки в админке, смена пароля
+    forget_users(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=UserRole)
+def role_changed(sender, instance, **kwargs):
+    # Роль закэширована вместе с каждым пользователем, у которого она указана
+    forget_users(*User.objects.filter(role=instance).values_list('pk', flat=True))
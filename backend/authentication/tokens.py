@@ -0,0 +1,12 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .revocation import GENERATION_CLAIM
+
+
+def issue_access_token(user):
+    """Access-токен; имя и роль пользователя лежат в claims, клиенту не нужен отдельный запрос"""
+    refresh = RefreshToken.for_user(user)
+    refresh['username'] = user.username
+    refresh['role_id'] = user.role_id
+    refresh[GENERATION_CLAIM] = user.token_generation
+    return str(refresh.access_token)
@@ -1,18 +1,24 @@
 from rest_framework.viewsets import ModelViewSet
+from core.pagination import UserPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError, NotFound, AuthenticationFailed
 from authentication.models import User, UserRole, FriendRequest
-from authentication.serializers import UserRoleSerializer, UserSerializer, FriendRequestSerializer
+from authentication.serializers import UserRoleSerializer, UserSerializer, UserBriefSerializer, FriendRequestSerializer
+from authentication.search import DEFAULT_LIMIT, MAX_LIMIT, search_users
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from authentication.revocation import revoke_all, revoke_token
+from authentication.tokens import issue_access_token
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db.models import Q
 from rest_framework import status
 
 
 class UserViewSet(ModelViewSet):
     serializer_class = UserSerializer
-    queryset = User.objects.all()
+    pagination_class = UserPagination
+    queryset = User.objects.select_related('role')
 
     @action(methods=['POST'], detail=False, url_path='register')
     def register(self, request):
@@ -22,12 +28,11 @@ class UserViewSet(ModelViewSet):
 
         user = User.objects.get(email=request.data['email'])
 
-        refresh = RefreshToken.for_user(user)
         response = Response()
 
         data = self.serializer_class(user).data
 
-        response.data = {'access': str(refresh.access_token), 'data': data}
+        response.data = {'access': issue_access_token(user), 'data': data}
         return response
     
     @action(methods=['POST'], detail=False, url_path='login')
@@ -45,14 +50,46 @@ class UserViewSet(ModelViewSet):
         if not user.check_password(request.data['password']):
             raise AuthenticationFailed({'error': 'This password is not correct. Check the login and enter the password again!'})
 
-        refresh = RefreshToken.for_user(user)
         response = Response()
 
         data = self.serializer_class(user).data
 
-        response.data = {'access': str(refresh.access_token), 'data': data}
+        response.data = {'access': issue_access_token(user), 'data': data}
         return response
 
+    @action(methods=['POST'], detail=False, permission_classes=[IsAuthenticated], url_path='logout')
+    def logout(self, request):
+        """Выход с текущего устройства: отзывает токен запроса"""
+        revoke_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(methods=['POST'], detail=False, permission_classes=[IsAuthenticated], url_path='logout-all')
+    def logout_all(self, request):
+        """Выход со всех устройств: отзывает все выданные пользователю токены"""
+        revoke_all(request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(methods=['POST'], detail=False, permission_classes=[IsAuthenticated], url_path='change-password')
+    def change_password(self, request):
+        """Смена пароля; старые токены отзываются, в ответе новый"""
+        old_password = request.data.get('old_password')
+        new_password = request.data.get('new_password')
+        if not old_password or not new_password:
+            raise ValidationError({'error': 'Поля old_password и new_password обязательны'})
+
+        user = User.objects.get(pk=request.user.pk)
+        if not user.check_password(old_password):
+            raise AuthenticationFailed({'error': 'Неверный текущий пароль'})
+        try:
+            validate_password(new_password, user)
+        except DjangoValidationError as e:
+            raise ValidationError({'new_password': e.messages})
+
+        user.set_password(new_password)
+        user.token_generation += 1
+        user.save(update_fields=['password', 'token_generation'])
+        return Response({'access': issue_access_token(user)})
+
     @action(methods=['GET'], detail=False, permission_classes=[IsAuthenticated], url_path='me')
     def get_user(self,request):
         user = request.user
@@ -62,24 +99,21 @@ class UserViewSet(ModelViewSet):
     
     @action(detail=False, methods=['GET'], permission_classes=[IsAuthenticated])
     def search(self, request):
-        username = request.query_params.get('username', '')
-        if not username:
+        """Поиск пользователей по началу имени или email (?q=, прежний ?username=)"""
+        query = request.query_params.get('q') or request.query_params.get('username', '')
+        if not query.strip():
             return Response(
-                {'error': 'Параметр username обязателен'},
+                {'error': 'Параметр q обязателен'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        friend_ids = request.user.friends.values_list('id', flat=True)
-        
-        users = User.objects.filter(
-            username__istartswith=username
-        ).exclude(
-            id=request.user.id
-        ).exclude(
-            id__in=friend_ids
-        )
-        
-        serializer = self.get_serializer(users, many=True)
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        except ValueError:
+            return Response({'error': 'limit должен быть числом'}, status=status.HTTP_400_BAD_REQUEST)
+
+        users = search_users(query, request.user, limit)
+        serializer = UserBriefSerializer(users, many=True, context={'request': request})
         return Response(serializer.data)
 
 
@@ -201,7 +235,8 @@ class UserViewSet(ModelViewSet):
     @action(detail=False, methods=['PATCH'], permission_classes=[IsAuthenticated], url_path='update-profile')
     def update_profile(self, request):
         """Обновление профиля пользователя"""
-        user = request.user
+        # request.user собран из кэша и может отставать: сохраняем свежую строку
+        user = User.objects.select_related('role').get(pk=request.user.pk)
         photo = request.data.get('photo')
         role_id = request.data.get('role')
         
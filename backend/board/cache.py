@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.core.cache import caches
+
+from core.versions import bump_versions, get_versions
+
+# Последняя часть — адрес сайта: ссылки на файлы в снимке абсолютные
+SNAPSHOT_KEY = 'board:{}:v{}:snapshot:{}'
+HITS_KEY = 'board-cache:hits'
+MISSES_KEY = 'board-cache:misses'
+
+
+def get_cache():
+    return caches[settings.BOARD_CACHE_ALIAS]
+
+
+def get_board_versions(board_ids):
+    """Текущие версии досок: {board_id: version}"""
+    return get_versions('board', board_ids)
+
+
+def bump_board_version(*board_ids):
+    """Инвалидирует снимки досок, переводя их на новую версию"""
+    bump_versions('board', *board_ids)
+
+
+def get_board_snapshots(board_ids, build, origin=''):
+    """
+    Сериализованные доски в порядке board_ids для сайта origin.
+    build(missing_ids) должен вернуть {board_id: data} для досок, которых нет в кэше.
+    """
+    cache = get_cache()
+    versions = get_board_versions(board_ids)
+    keys = {SNAPSHOT_KEY.format(board_id, versions[board_id], origin): board_id for board_id in board_ids}
+
+    snapshots = {keys[key]: data for key, data in cache.get_many(keys).items()}
+    missing = [board_id for board_id in board_ids if board_id not in snapshots]
+
+    _count(HITS_KEY, len(snapshots))
+    _count(MISSES_KEY, len(missing))
+
+    if missing:
+        built = build(missing)
+        cache.set_many(
+            {SNAPSHOT_KEY.format(board_id, versions[board_id], origin): data for board_id, data in built.items()},
+            settings.BOARD_CACHE_TIMEOUT
+        )
+        snapshots.update(built)
+
+    return [snapshots[board_id] for board_id in board_ids if board_id in snapshots]
+
+
+def get_cache_stats():
+    cache = get_cache()
+    stats = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = stats.get(HITS_KEY, 0)
+    misses = stats.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else None,
+    }
+
+
+def _count(key, amount):
+    if not amount:
+        return
+    cache = get_cache()
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        cache.set(key, amount, None)
@@ -0,0 +1,86 @@
+"""
+Дельта-синхронизация доски: все, что изменилось после токена.
+
+Токен — момент времени в микросекундах. Измененные объекты находятся по
+updated_at, удаленные — по надгробиям (Tombstone). Окно OVERLAP повторно
+отдает изменения последних секунд: запись, сохраненная до выдачи токена,
+но закоммиченная после, не теряется. Повторы безопасны — клиент применяет
+изменения по id.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from column.models import Column
+from column.serializers import ColumnRefSerializer
+from comment.models import Comment
+from comment.serializers import CommentSerializer
+from task.models import Task, Subtask
+from task.serializers import TaskChangeSerializer, SubtaskChangeSerializer
+from .models import Tombstone
+
+OVERLAP = timedelta(seconds=2)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def make_token(moment):
+    return str((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def parse_token(token):
+    """Момент времени из токена; ValueError, если токен некорректен"""
+    micros = int(token)
+    if micros < 0:
+        raise ValueError(token)
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def is_expired(since):
+    """Надгробия старше срока хранения удаляются, такой токен уже не восстановить"""
+    return since < timezone.now() - settings.BOARD_TOMBSTONE_TTL
+
+
+def record_deletion(kind, object_id, *board_ids):
+    Tombstone.objects.bulk_create([
+        Tombstone(board_id=board_id, kind=kind, object_id=object_id)
+        for board_id in set(filter(None, board_ids))
+    ])
+
+
+def get_board_changes(board_id, since=None, request=None):
+    """
+    Колонки, задачи, подзадачи и комментарии доски, измененные после since,
+    и id удаленных. Без since отдается все содержимое доски.
+    """
+    token = make_token(timezone.now())
+    context = {'request': request}
+
+    columns = Column.objects.filter(board_id=board_id)
+    tasks = Task.objects.filter(column__board_id=board_id).select_related(
+        'assigned_to__role', 'priority', 'report__author__role'
+    ).prefetch_related('tags')
+    subtasks = Subtask.objects.filter(task__column__board_id=board_id)
+    comments = Comment.objects.filter(task__column__board_id=board_id).select_related('author__role')
+
+    deleted = {kind: [] for kind, _ in Tombstone.KIND_CHOICES}
+    if since is not None:
+        since -= OVERLAP
+        columns = columns.filter(updated_at__gte=since)
+        tasks = tasks.filter(updated_at__gte=since)
+        subtasks = subtasks.filter(updated_at__gte=since)
+        comments = comments.filter(updated_at__gte=since)
+
+        tombstones = Tombstone.objects.filter(board_id=board_id, deleted_at__gte=since)
+        for kind, object_id in tombstones.values_list('kind', 'object_id'):
+            deleted[kind].append(object_id)
+
+    return {
+        'token': token,
+        'columns': ColumnRefSerializer(columns, many=True).data,
+        'tasks': TaskChangeSerializer(tasks, many=True, context=context).data,
+        'subtasks': SubtaskChangeSerializer(subtasks, many=True).data,
+        'comments': CommentSerializer(comments.order_by('created_at', 'id'), many=True, context=context).data,
+        'deleted': deleted,
+    }
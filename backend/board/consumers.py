@@ -0,0 +1,32 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .events import board_group
+from .models import Board
+
+
+class BoardConsumer(AsyncJsonWebsocketConsumer):
+    """Подписка участника проекта на изменения доски: ws/boards/<id>/?token=<jwt>"""
+
+    async def connect(self):
+        self.board_id = self.scope['url_route']['kwargs']['board_id']
+        user = self.scope.get('user')
+
+        if user is None or not user.is_authenticated or not await self.is_member(user):
+            await self.close(code=4403)
+            return
+
+        self.group_name = board_group(self.board_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if hasattr(self, 'group_name'):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def board_event(self, message):
+        await self.send_json(message['event'])
+
+    @database_sync_to_async
+    def is_member(self, user):
+        return Board.objects.filter(pk=self.board_id, project__members=user).exists()
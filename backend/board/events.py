@@ -0,0 +1,71 @@
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Типы событий, которые получают подписчики доски
+TASK_CREATED = 'task.created'
+TASK_UPDATED = 'task.updated'
+TASK_MOVED = 'task.moved'
+TASKS_REORDERED = 'tasks.reordered'
+TASK_DELETED = 'task.deleted'
+COMMENT_ADDED = 'comment.added'
+TIMER_STARTED = 'timer.started'
+TIMER_STOPPED = 'timer.stopped'
+
+
+def board_group(board_id):
+    return f'board_{board_id}'
+
+
+def task_delta(task):
+    """Компактное представление задачи для дельты — без вложенных объектов"""
+    return {
+        'id': task.pk,
+        'column_id': task.column_id,
+        'rank': task.rank,
+        'title': task.title,
+        'assigned_to_id': task.assigned_to_id,
+        'priority_id': task.priority_id,
+        'due_date': task.due_date.isoformat() if task.due_date else None,
+        'is_completed': task.is_completed,
+        'updated_at': task.updated_at.isoformat() if task.updated_at else None,
+    }
+
+
+def send_board_event(board_id, event_type, data):
+    """Рассылает событие подписчикам доски после коммита текущей транзакции"""
+    send_board_events([(board_id, event_type, data)])
+
+
+def send_board_events(items):
+    """
+    Рассылает пачку событий [(board_id, event_type, data)] после коммита —
+    одним переходом в event loop слоя каналов вместо перехода на событие.
+    """
+    messages = [
+        (board_group(board_id), {'type': 'board.event', 'event': {'type': event_type, 'board_id': board_id, 'data': data}})
+        for board_id, event_type, data in items
+        if board_id is not None
+    ]
+    if messages:
+        transaction.on_commit(lambda: _group_send(messages))
+
+
+def _group_send(messages):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+
+    async def send_all():
+        for group, message in messages:
+            await channel_layer.group_send(group, message)
+
+    try:
+        async_to_sync(send_all)()
+    except Exception:
+        # Недоступный слой каналов не должен ломать сам запрос
+        logger.exception('Не удалось отправить события досок %s', sorted({group for group, _ in messages}))
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from board.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = 'Удаляет записи об удаленных объектах старше BOARD_TOMBSTONE_TTL'
+
+    def handle(self, *args, **options):
+        horizon = timezone.now() - settings.BOARD_TOMBSTONE_TTL
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=horizon).delete()
+        self.stdout.write(self.style.SUCCESS(f'Удалено записей: {deleted}'))
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0006_alter_board_icon'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board_id', models.BigIntegerField()),
+                ('kind', models.CharField(choices=[('column', 'Колонка'), ('task', 'Задача'), ('subtask', 'Подзадача'), ('comment', 'Комментарий')], max_length=16)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Удаленный объект',
+                'verbose_name_plural': 'Удаленные объекты',
+                'indexes': [models.Index(fields=['board_id', 'deleted_at'], name='board_tombs_board_i_7c3f90_idx')],
+            },
+        ),
+    ]
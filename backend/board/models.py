@@ -12,4 +12,28 @@ class Board(models.Model):
     class Meta:
         verbose_name = 'Доска'
         verbose_name_plural = 'Доски'
-        unique_together = [['project', 'name']]
\ No newline at end of file
+        unique_together = [['project', 'name']]
+
+class Tombstone(models.Model):
+    """Запись об удаленном объекте доски для /boards/{id}/changes/"""
+    COLUMN = 'column'
+    TASK = 'task'
+    SUBTASK = 'subtask'
+    COMMENT = 'comment'
+    KIND_CHOICES = [
+        (COLUMN, 'Колонка'),
+        (TASK, 'Задача'),
+        (SUBTASK, 'Подзадача'),
+        (COMMENT, 'Комментарий'),
+    ]
+
+    # Без внешнего ключа: надгробия пишутся и при каскадном удалении самой доски
+    board_id = models.BigIntegerField()
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Удаленный объект'
+        verbose_name_plural = 'Удаленные объекты'
+        indexes = [models.Index(fields=['board_id', 'deleted_at'])]
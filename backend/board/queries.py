@@ -0,0 +1,17 @@
+from django.db.models import Prefetch
+
+from column.models import Column
+from task.models import Task
+from task.queries import with_task_details
+
+
+def with_board_tree(queryset):
+    """
+    Подгружает доску целиком: колонки → задачи → теги, подзадачи, комментарии.
+    Количество запросов фиксировано и не зависит от числа задач на доске.
+    """
+    return queryset.prefetch_related(
+        Prefetch('columns', queryset=Column.objects.prefetch_related(
+            Prefetch('tasks', queryset=with_task_details(Task.objects.all())),
+        )),
+    )
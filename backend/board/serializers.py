@@ -1,8 +1,11 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsMixin
 from .models import Board 
+from .cache import get_board_snapshots
+from .queries import with_board_tree
 from column.serializers import ColumnSerializer
 
-class BoardSerializer(serializers.ModelSerializer):
+class BoardSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     project_id = serializers.IntegerField(write_only=True)
     columns = ColumnSerializer(many=True, read_only=True)
     
@@ -11,4 +14,28 @@ class BoardSerializer(serializers.ModelSerializer):
         fields = ['id', 'project_id', 'name', 'created_at', 'icon', 'columns', 'is_sprint']
         extra_kwargs = {
             'project_id': {'required': True}
-        }
\ No newline at end of file
+        }
+
+
+class BoardSummarySerializer(serializers.ModelSerializer):
+    """Доска без колонок и задач — для списков и переключателей"""
+    class Meta:
+        model = Board
+        fields = ['id', 'name', 'icon', 'is_sprint']
+
+
+def serialize_boards(board_ids, request=None):
+    """
+    Полные доски в порядке board_ids. Берутся из кэша снимков,
+    недостающие собираются одним проходом with_board_tree. Снимки
+    хранятся отдельно для каждого адреса сайта: с request ссылки на
+    фотографии строятся абсолютными.
+    """
+    def build(missing_ids):
+        boards = with_board_tree(Board.objects.filter(pk__in=missing_ids))
+        # Без view в контексте: снимок не должен зависеть от ?fields= запроса
+        context = {'request': request}
+        return {board.pk: BoardSerializer(board, context=context).data for board in boards}
+
+    origin = request.build_absolute_uri('/') if request is not None else ''
+    return get_board_snapshots(list(board_ids), build, origin)
@@ -0,0 +1,123 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from authentication.models import User
+from column.models import Column
+from comment.models import Comment
+from priority.models import Priority
+from report.models import Report
+from tag.models import Tag
+from task.models import Task, Subtask
+from .cache import bump_board_version
+from .changes import record_deletion
+from .models import Board, Tombstone
+
+
+def board_ids_for_task(task_id):
+    return Task.objects.filter(pk=task_id).values_list('column__board_id', flat=True)
+
+
+def board_ids_for_project(project_id):
+    return Board.objects.filter(project_id=project_id).values_list('id', flat=True)
+
+
+def touch_tasks(**filters):
+    # Связанные данные выводятся внутри задачи: она должна попасть в дельту доски
+    Task.objects.filter(**filters).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=Board)
+def board_changed(sender, instance, **kwargs):
+    bump_board_version(instance.pk)
+
+
+@receiver(post_delete, sender=Board)
+def board_deleted(sender, instance, **kwargs):
+    Tombstone.objects.filter(board_id=instance.pk).delete()
+
+
+@receiver([post_save, post_delete], sender=Column)
+def column_changed(sender, instance, **kwargs):
+    bump_board_version(instance.board_id)
+
+
+@receiver(post_delete, sender=Column)
+def column_deleted(sender, instance, **kwargs):
+    record_deletion(Tombstone.COLUMN, instance.pk, instance.board_id)
+
+
+@receiver(pre_save, sender=Task)
+def task_moving(sender, instance, update_fields=None, **kwargs):
+    # При переносе задачи на другую доску старая доска тоже меняется
+    if instance.pk is None or (update_fields is not None and 'column' not in update_fields):
+        return
+    instance._previous_board_ids = list(board_ids_for_task(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Task)
+def task_changed(sender, instance, signal, **kwargs):
+    board_id = Column.objects.filter(pk=instance.column_id).values_list('board_id', flat=True).first()
+    previous_board_ids = getattr(instance, '_previous_board_ids', [])
+    bump_board_version(board_id, *previous_board_ids)
+
+    if signal is post_delete:
+        record_deletion(Tombstone.TASK, instance.pk, board_id)
+    else:
+        # Для старой доски перенесенная задача выглядит удаленной
+        record_deletion(Tombstone.TASK, instance.pk, *set(previous_board_ids) - {board_id})
+
+
+@receiver(m2m_changed, sender=Task.tags.through)
+def task_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        bump_board_version(*board_ids_for_project(instance.project_id))
+        if pk_set:
+            touch_tasks(pk__in=pk_set)
+    else:
+        bump_board_version(*board_ids_for_task(instance.pk))
+        touch_tasks(pk=instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Subtask)
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=Report)
+def task_child_changed(sender, instance, signal, **kwargs):
+    board_ids = list(board_ids_for_task(instance.task_id))
+    bump_board_version(*board_ids)
+
+    if sender is Report:
+        # Отчет выводится внутри задачи
+        touch_tasks(pk=instance.task_id)
+    elif signal is post_delete:
+        kind = Tombstone.SUBTASK if sender is Subtask else Tombstone.COMMENT
+        record_deletion(kind, instance.pk, *board_ids)
+
+
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Priority)
+def project_dictionary_changed(sender, instance, **kwargs):
+    bump_board_version(*board_ids_for_project(instance.project_id))
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def tag_changed(sender, instance, created=False, **kwargs):
+    if not created:
+        touch_tasks(tags=instance)
+
+
+@receiver(post_save, sender=Priority)
+@receiver(pre_delete, sender=Priority)
+def priority_changed(sender, instance, created=False, **kwargs):
+    if not created:
+        touch_tasks(priority=instance)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, **kwargs):
+    # Имя и фото пользователя выводятся в задачах и комментариях досок его проектов
+    if not created:
+        bump_board_version(*Board.objects.filter(project__members=instance).values_list('id', flat=True))
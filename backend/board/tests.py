@@ -0,0 +1,125 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from authentication.models import User, UserRole
+from column.models import Column
+from comment.models import Comment
+from priority.models import Priority
+from project.membership import get_memberships
+from project.models import Project, ProjectMembers
+from tag.models import Tag
+from task.models import Subtask, Task
+from .cache import get_cache
+from .models import Board
+
+# Доска, колонки, задачи с исполнителем, приоритетом и отчетом, теги, подзадачи, комментарии
+TREE_QUERIES = 6
+
+
+class BoardTreeQueriesTest(TestCase):
+    """Доска отдается за фиксированное число запросов, сколько бы на ней ни было задач"""
+
+    @classmethod
+    def setUpTestData(cls):
+        UserRole.objects.create(id=2, name='Разработчик')  # роль нового пользователя по умолчанию
+        cls.user = User.objects.create_user(email='owner@example.com', username='owner', password='password')
+        cls.project = Project.objects.create(name='Проект', owner=cls.user)
+        ProjectMembers.objects.create(project=cls.project, user=cls.user)
+        cls.priority = Priority.objects.create(project=cls.project, name='Высокий', order=1)
+        cls.tags = [Tag.objects.create(project=cls.project, name=f'Тег {i}') for i in range(2)]
+        cls.small = cls.create_board(tasks_per_column=1)
+        cls.large = cls.create_board(tasks_per_column=10)
+
+    @classmethod
+    def create_board(cls, tasks_per_column):
+        board = Board.objects.create(project=cls.project, name=f'Доска на {tasks_per_column}')
+        for order in range(3):
+            column = Column.objects.create(board=board, name=f'Колонка {order}', order=order)
+            for i in range(tasks_per_column):
+                task = Task.objects.create(
+                    column=column, title=f'Задача {i}', rank=f'{i:05d}',
+                    assigned_to=cls.user, priority=cls.priority,
+                )
+                task.tags.set(cls.tags)
+                Subtask.objects.create(task=task, title='Подзадача', rank='i')
+                Comment.objects.create(task=task, author=cls.user, content='Комментарий')
+        return board
+
+    def setUp(self):
+        get_cache().clear()
+        get_memberships(self.user.pk)  # участие в проектах уже в кэше, как у активного пользователя
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_board(self, board):
+        response = self.client.get(f'/api/v1/boards/{board.pk}/')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_cold_snapshot_queries_do_not_depend_on_tasks(self):
+        # id доски и дерево with_board_tree
+        for board in (self.small, self.large):
+            with self.subTest(board=board.name), self.assertNumQueries(1 + TREE_QUERIES):
+                response = self.get_board(board)
+            tasks = sum(len(column['tasks']) for column in response.data['columns'])
+            self.assertEqual(tasks, Task.objects.filter(column__board=board).count())
+
+    def test_warm_snapshot_reads_only_board_id(self):
+        for board in (self.small, self.large):
+            cold = self.get_board(board)
+            with self.subTest(board=board.name), self.assertNumQueries(1):
+                warm = self.get_board(board)
+            self.assertEqual(warm.data, cold.data)
+
+    def test_change_invalidates_snapshot(self):
+        self.get_board(self.small)
+        Task.objects.create(column=self.small.columns.first(), title='Новая', rank='zzzzz')
+
+        with self.assertNumQueries(1 + TREE_QUERIES):
+            response = self.get_board(self.small)
+        titles = [task['title'] for column in response.data['columns'] for task in column['tasks']]
+        self.assertIn('Новая', titles)
+
+    @override_settings(ALLOWED_HOSTS=['one.example', 'two.example'])
+    def test_snapshot_urls_follow_request_host(self):
+        User.objects.filter(pk=self.user.pk).update(photo='user_photos/owner.png')
+        for host in ('one.example', 'two.example'):
+            response = self.client.get(f'/api/v1/boards/{self.small.pk}/', HTTP_HOST=host)
+            assignee = response.data['columns'][0]['tasks'][0]['assigned_to']
+            self.assertEqual(assignee['photo'], f'http://{host}/media/user_photos/owner.png')
+
+
+class BoardAccessTest(TestCase):
+    """Доски и их изменения видят только участники проекта"""
+
+    @classmethod
+    def setUpTestData(cls):
+        UserRole.objects.create(id=2, name='Разработчик')
+        cls.member = User.objects.create_user(email='member@example.com', username='member', password='password')
+        cls.stranger = User.objects.create_user(email='stranger@example.com', username='stranger', password='password')
+        project = Project.objects.create(name='Проект', owner=cls.member)
+        ProjectMembers.objects.create(project=project, user=cls.member)
+        cls.board = Board.objects.create(project=project, name='Доска')
+        column = Column.objects.create(board=cls.board, name='Колонка', order=0)
+        Task.objects.create(column=column, title='Задача', rank='i')
+
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+
+    def test_anonymous_cannot_read_changes(self):
+        response = self.client.get(f'/api/v1/boards/{self.board.pk}/changes/?since=0')
+        self.assertEqual(response.status_code, 401)
+
+    def test_stranger_cannot_read_board(self):
+        self.client.force_authenticate(self.stranger)
+        for url in (f'/api/v1/boards/{self.board.pk}/changes/', f'/api/v1/boards/{self.board.pk}/'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get('/api/v1/boards/').data, [])
+
+    def test_member_reads_changes(self):
+        self.client.force_authenticate(self.member)
+        response = self.client.get(f'/api/v1/boards/{self.board.pk}/changes/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task['title'] for task in response.data['tasks']], ['Задача'])
@@ -1,23 +1,27 @@
 from rest_framework.viewsets import ModelViewSet
 from rest_framework import serializers
+from rest_framework.exceptions import NotFound
 
 from .models import Board
 from project.models import Project
-from .serializers import BoardSerializer
+from .serializers import BoardSerializer, serialize_boards
+from .cache import get_board_versions, get_cache_stats
+from .changes import get_board_changes, is_expired, parse_token
+from core.etag import ConditionalGetMixin
+from core.serializers import select_fields
+from project.membership import get_request_memberships
+from project.permissions import ProjectScopedMixin
 
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.permissions import IsAdminUser
 from rest_framework import status
 from column.models import Column
 from column.serializers import ColumnSerializer
 
 
-class BoardViewSet(ModelViewSet):
-    queryset = Board.objects.prefetch_related(
-        'columns__tasks__subtasks',  # колонки → задачи → подзадачи
-        'columns__tasks__tags',      # колонки → задачи → теги
-        'columns__tasks__assigned_to' # колонки → задачи → исполнитель
-    ).select_related('project')
+class BoardViewSet(ProjectScopedMixin, ConditionalGetMixin, ModelViewSet):
+    project_lookup = 'project_id'
     serializer_class = BoardSerializer
     queryset = Board.objects.all()
 
@@ -33,14 +37,71 @@ class BoardViewSet(ModelViewSet):
             
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, self.get_list_fingerprint, self.list_snapshots)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, self.get_object_fingerprint, self.retrieve_snapshot)
+
+    def list_snapshots(self, request):
+        # Доски отдаются из кэша снимков, из базы читаются только id
+        boards = serialize_boards(self.get_board_ids(), request)
+        return Response([select_fields(board, request) for board in boards])
+
+    def retrieve_snapshot(self, request):
+        data, = serialize_boards([self.get_object_id()], request)
+        return Response(select_fields(data, request))
+
+    def get_list_fingerprint(self):
+        return sorted(get_board_versions(self.get_board_ids()).items())
+
+    def get_object_fingerprint(self):
+        return get_board_versions([self.get_object_id()])
+
+    def get_board_ids(self):
+        # Запоминаем на время запроса: id нужны и для ETag, и для ответа
+        if not hasattr(self, '_board_ids'):
+            self._board_ids = list(self.filter_queryset(self.get_queryset()).values_list('pk', flat=True))
+        return self._board_ids
+
+    def get_object_id(self):
+        if not hasattr(self, '_board_id'):
+            lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+            queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: lookup})
+            self._board_id = queryset.values_list('pk', flat=True).first()
+        if self._board_id is None:
+            raise NotFound()
+        return self._board_id
+
+    @action(detail=True, methods=['GET'])
+    def changes(self, request, pk=None):
+        """Изменения доски после ?since=<token>; без since — все содержимое доски"""
+        board_id = self.get_object_id()
+
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since = parse_token(since)
+            except (ValueError, OverflowError):
+                return Response({"error": "Invalid since token"}, status=status.HTTP_400_BAD_REQUEST)
+            if is_expired(since):
+                # Удаления за этот период уже не восстановить — клиент загружает доску заново
+                return Response({"error": "Token expired, reload the board"}, status=status.HTTP_410_GONE)
+
+        return Response(get_board_changes(board_id, since or None, request))
+
+    @action(detail=False, methods=['GET'], url_path='cache-stats', permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        return Response(get_cache_stats())
+
     def perform_create(self, serializer):
         project_id = self.request.data.get('project_id')
         if not project_id:
             raise serializers.ValidationError({"project": "This field is required."})
         
         try:
-            project = Project.objects.get(pk=project_id)
-        except Project.DoesNotExist:
+            project = Project.objects.get(pk=project_id, pk__in=list(get_request_memberships(self.request)))
+        except (Project.DoesNotExist, ValueError):
             raise serializers.ValidationError({"project": "Project not found."})
             
         serializer.save(project=project)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('column', '0004_alter_column_options_column_is_default_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='column',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:56
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_open_tasks(apps, schema_editor):
+    Column = apps.get_model('column', 'Column')
+    Task = apps.get_model('task', 'Task')
+    counts = (
+        Task.objects.filter(column__isnull=False, is_completed=False).order_by()
+        .values('column_id').annotate(count=Count('pk')).values_list('column_id', 'count')
+    )
+    columns = [Column(pk=column_id, open_tasks=count) for column_id, count in counts]
+    Column.objects.bulk_update(columns, ['open_tasks'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('column', '0005_column_updated_at'),
+        ('task', '0015_assignee_covering_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='column',
+            name='open_tasks',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_open_tasks, migrations.RunPython.noop),
+    ]
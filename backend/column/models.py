@@ -7,6 +7,9 @@ class Column(models.Model):
     name = models.CharField(max_length=100)
     order = models.IntegerField()
     is_default = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Открытых задач в колонке; меняется через F() в project/stats.py
+    open_tasks = models.PositiveIntegerField(default=0)
     
     class Meta:
         verbose_name = 'Колонка'
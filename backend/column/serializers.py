@@ -2,6 +2,15 @@ from rest_framework import serializers
 from .models import Column
 from task.serializers import BaseTaskSerializer  # Импортируем базовый сериализатор
 
+class ColumnRefSerializer(serializers.ModelSerializer):
+    """Короткая ссылка на колонку без вложенных задач"""
+    board_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Column
+        fields = ['id', 'name', 'order', 'board_id']
+
+
 class ColumnSerializer(serializers.ModelSerializer):
     tasks = BaseTaskSerializer(many=True, read_only=True)  # Используем базовый
     
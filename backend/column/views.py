@@ -1,9 +1,11 @@
 from rest_framework.viewsets import ModelViewSet
 
+from project.permissions import ProjectScopedMixin
 from .models import Column
 from .serializers import ColumnSerializer
 
 
-class ColumnViewSet(ModelViewSet):
+class ColumnViewSet(ProjectScopedMixin, ModelViewSet):
+    project_lookup = 'board__project_id'
     serializer_class = ColumnSerializer
     queryset = Column.objects.all()
\ No newline at end of file
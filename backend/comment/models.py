@@ -8,6 +8,7 @@ class Comment(models.Model):
     content = models.TextField(verbose_name='Контент')
     is_approved = models.BooleanField(verbose_name='Одобрен?', default=False)
     created_at = models.DateTimeField(verbose_name='Создан', auto_now_add=True)
+    updated_at = models.DateTimeField(verbose_name='Изменён', auto_now=True, db_index=True)
 
     def __str__(self):
         return f"Комментарий {self.author.username} к {self.task.title}"
@@ -15,3 +16,7 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            # Комментарии задачи в хронологическом порядке
+            models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_idx'),
+        ]
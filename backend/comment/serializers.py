@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsMixin
 from .models import Comment
 from authentication.serializers import UserSerializer
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)  # Только для чтения
     
     class Meta:
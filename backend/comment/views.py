@@ -1,9 +1,13 @@
 from rest_framework.viewsets import ModelViewSet
 
+from core.pagination import CommentPagination
+from project.permissions import ProjectScopedMixin
 from .models import Comment
 from .serializers import CommentSerializer
 
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(ProjectScopedMixin, ModelViewSet):
+    project_lookup = 'task__column__board__project_id'
     serializer_class = CommentSerializer
-    queryset = Comment.objects.all()
\ No newline at end of file
+    pagination_class = CommentPagination
+    queryset = Comment.objects.select_related('author__role')
\ No newline at end of file
@@ -0,0 +1,57 @@
+import hashlib
+
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    Строгие ETag для list/retrieve. ETag строится из дешевого отпечатка версии
+    данных (get_list_fingerprint / get_object_fingerprint), поэтому ответ 304
+    на If-None-Match отдается без сериализации тела. Отпечатки задает
+    наследник; пока метод не переопределен и возвращает None, ответ
+    отдается как обычно, без ETag.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, self.get_list_fingerprint, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, self.get_object_fingerprint, super().retrieve, *args, **kwargs)
+
+    def get_list_fingerprint(self):
+        """Версия данных списка: меняется при любом изменении его элементов"""
+        return None
+
+    def get_object_fingerprint(self):
+        """Версия данных объекта: меняется при любом изменении тела ответа"""
+        return None
+
+    def conditional_response(self, request, fingerprint, respond, *args, **kwargs):
+        fingerprint = fingerprint()
+        if fingerprint is None:
+            return respond(request, *args, **kwargs)
+
+        etag = self.make_etag(request, fingerprint)
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = respond(request, *args, **kwargs)
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            # Браузер хранит ответ, но всегда перепроверяет его на сервере
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def make_etag(self, request, fingerprint):
+        # Тело ответа зависит и от запроса: ?fields=, ?expand=, курсора, формата и пользователя
+        key = repr((
+            fingerprint,
+            request.get_full_path(),
+            request.user.pk,
+            request.accepted_renderer.format,
+        ))
+        return quote_etag(hashlib.sha1(key.encode()).hexdigest())
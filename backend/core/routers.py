@@ -8,7 +8,7 @@ from priority.views import PriorityViewSet
 from project.views import ProjectViewSet, ProjectMembersViewSet
 from report.views import ReportViewSet
 from tag.views import TagViewSet
-from task.views import TaskViewSet
+from task.views import TaskViewSet, TimeEntryViewSet
 
 router = DefaultRouter()
 
@@ -23,3 +23,4 @@ router.register('members', ProjectMembersViewSet)
 router.register('report', ReportViewSet)
 router.register('tag', TagViewSet)
 router.register('task', TaskViewSet)
+router.register('time-entries', TimeEntryViewSet)
@@ -0,0 +1,53 @@
+from rest_framework import serializers
+
+FIELDS_QUERY_PARAM = 'fields'
+
+
+def get_requested_fields(request):
+    """Набор полей из ?fields=id,title,... или None, если параметр не передан"""
+    if request is None or request.method != 'GET':
+        return None
+
+    value = request.query_params.get(FIELDS_QUERY_PARAM)
+    if not value:
+        return None
+    return set(filter(None, value.split(',')))
+
+
+def select_fields(data, request):
+    """?fields= для уже сериализованных данных (например, снимков из кэша)"""
+    requested = get_requested_fields(request)
+    if not requested:
+        return data
+    return {name: value for name, value in data.items() if name in requested}
+
+
+class SparseFieldsMixin:
+    """
+    Поддержка ?fields=id,title,... — в ответе остаются только запрошенные поля.
+    Применяется только к сериализатору, которым отвечает view,
+    вложенные и вспомогательные сериализаторы отдаются как есть.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        if not self.is_response_serializer():
+            return fields
+
+        requested = get_requested_fields(self.context.get('request'))
+        if not requested:
+            return fields
+
+        return {name: field for name, field in fields.items() if name in requested}
+
+    def is_response_serializer(self):
+        view = self.context.get('view')
+        if view is None or not isinstance(self, view.get_serializer_class()):
+            return False
+
+        parent = self.parent
+        if parent is None:
+            return True
+        # many=True: сам сериализатор — child у корневого ListSerializer
+        return isinstance(parent, serializers.ListSerializer) and parent.parent is None
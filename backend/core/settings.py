@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -76,6 +77,8 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+CORS_EXPOSE_HEADERS = ['ETag']
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
@@ -96,17 +99,135 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'core.wsgi.application'
 
+ASGI_APPLICATION = 'core.asgi.application'
+
+
+# Channels
+# https://channels.readthedocs.io/en/stable/topics/channel_layers.html
+# In-memory слой работает только в пределах одного процесса; для нескольких
+# процессов задайте CHANNEL_LAYER_REDIS_URL (нужен пакет channels-redis)
+
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    }
+}
+
+if os.environ.get('CHANNEL_LAYER_REDIS_URL'):
+    CHANNEL_LAYERS['default'] = {
+        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'CONFIG': {
+            'hosts': [os.environ['CHANNEL_LAYER_REDIS_URL']],
+        },
+    }
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# По умолчанию SQLite (разработка и тесты). В продакшене DB_ENGINE=postgresql:
+# постоянные соединения (DB_CONN_MAX_AGE) с проверкой перед использованием
+# или пул соединений psycopg 3 (DB_POOL=1, нужен пакет psycopg[pool])
+
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'diplom'),
+            'USER': os.environ.get('DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+
+    if os.environ.get('DB_POOL') == '1':
+        # Пул и постоянные соединения Django взаимоисключающие
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 20)),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        }
+
+    if os.environ.get('DB_PGBOUNCER') == '1':
+        # За PgBouncer в режиме transaction серверные курсоры не работают
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        }
+    }
 
-DATABASES = {
+    if os.environ.get('DB_SQLITE_TUNED') == '1':
+        # Однонодовая установка на SQLite: WAL не блокирует читателей писателем,
+        # BEGIN IMMEDIATE берет блокировку записи в начале транзакции, и при
+        # конкуренции соединение ждет ее до timeout вместо "database is locked"
+        DATABASES['default']['OPTIONS'] = {
+            'timeout': int(os.environ.get('DB_SQLITE_BUSY_TIMEOUT', 20)),
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                f'PRAGMA mmap_size={int(os.environ.get("DB_SQLITE_MMAP_SIZE", 256 * 1024 * 1024))};'
+                f'PRAGMA cache_size=-{int(os.environ.get("DB_SQLITE_CACHE_KB", 64 * 1024))};'
+                'PRAGMA temp_store=MEMORY;'
+            ),
+        }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# По умолчанию локальная память процесса; в продакшене — общий бэкенд,
+# например DJANGO_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', ''),
     }
 }
 
+# Счетчики версий объектов для инвалидации и ETag (core/versions.py)
+VERSION_CACHE_ALIAS = 'default'
+
+# Снимки сериализованных досок (board/cache.py)
+BOARD_CACHE_ALIAS = 'default'
+BOARD_CACHE_TIMEOUT = int(os.environ.get('BOARD_CACHE_TIMEOUT', 60 * 60))
+
+# Стартовые приоритеты, теги, доски и колонки нового проекта (project/bootstrap.py)
+PROJECT_TEMPLATE_PATH = os.environ.get('PROJECT_TEMPLATE_PATH', BASE_DIR / 'project' / 'project_template.json')
+
+# Аналитика проектов (project/analytics.py)
+ANALYTICS_CACHE_ALIAS = 'default'
+ANALYTICS_CACHE_TIMEOUT = int(os.environ.get('ANALYTICS_CACHE_TIMEOUT', 60 * 60))
+
+# Пользователи для JWT-аутентификации (authentication/cache.py): общий кэш
+# и LRU процесса с коротким TTL — на столько отстают другие процессы
+USER_CACHE_ALIAS = 'default'
+USER_CACHE_TIMEOUT = int(os.environ.get('USER_CACHE_TIMEOUT', 60 * 60))
+USER_LRU_SIZE = int(os.environ.get('USER_LRU_SIZE', 1024))
+USER_LRU_TTL = int(os.environ.get('USER_LRU_TTL', 30))
+
+# Отзыв токенов (authentication/revocation.py): фильтр Блума отозванных jti
+# в каждом процессе и как часто он догружает новые отзывы из базы
+REVOCATION_FILTER_CAPACITY = int(os.environ.get('REVOCATION_FILTER_CAPACITY', 100_000))
+REVOCATION_FILTER_ERROR_RATE = float(os.environ.get('REVOCATION_FILTER_ERROR_RATE', 0.001))
+REVOCATION_REFRESH_SECONDS = int(os.environ.get('REVOCATION_REFRESH_SECONDS', 5))
+
+# Участие пользователей в проектах для проверок доступа (project/membership.py)
+MEMBERSHIP_CACHE_ALIAS = 'default'
+MEMBERSHIP_CACHE_TIMEOUT = int(os.environ.get('MEMBERSHIP_CACHE_TIMEOUT', 60 * 60))
+
+# Сколько хранятся записи об удалениях для /boards/{id}/changes/ (board/changes.py)
+BOARD_TOMBSTONE_TTL = timedelta(days=int(os.environ.get('BOARD_TOMBSTONE_TTL_DAYS', 30)))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -155,7 +276,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.backends.CachedJWTAuthentication',
     )
 }
 
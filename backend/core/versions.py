@@ -0,0 +1,42 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+VERSION_KEY = '{}:{}:version'
+
+
+def get_cache():
+    return caches[settings.VERSION_CACHE_ALIAS]
+
+
+def _new_version():
+    # Версия на основе времени: если ключ версии вытеснен из кэша,
+    # новая версия не совпадет ни с одной из уже выданных
+    return time.time_ns()
+
+
+def get_versions(namespace, object_ids):
+    """Текущие версии объектов: {object_id: version}"""
+    cache = get_cache()
+    keys = {VERSION_KEY.format(namespace, object_id): object_id for object_id in object_ids}
+    found = cache.get_many(keys)
+
+    versions = {}
+    for key, object_id in keys.items():
+        if key not in found:
+            cache.add(key, _new_version(), None)
+            found[key] = cache.get(key)
+        versions[object_id] = found[key]
+    return versions
+
+
+def bump_versions(namespace, *object_ids):
+    """Переводит объекты на новую версию, делая устаревшими все снимки и ETag"""
+    cache = get_cache()
+    for object_id in set(filter(None, object_ids)):
+        key = VERSION_KEY.format(namespace, object_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), None)
@@ -2,7 +2,8 @@ from django.contrib import admin
 
 from project.models import Project
 from project.models import ProjectMembers
+from project.models import ProjectDailyStats
 
 admin.site.register(Project)
 admin.site.register(ProjectMembers)
-
+admin.site.register(ProjectDailyStats)
@@ -0,0 +1,189 @@
+"""
+Аналитика проекта: время цикла и выполнения, пропускная способность,
+незавершенная работа по колонкам и burndown спринт-досок.
+
+Построчно из базы читаются только задачи, выполненные за окно (нужны
+точные перцентили), и только из индекса task_column_completed_idx.
+Остальное база агрегирует сама: WIP — счетчики по колонкам, burndown —
+счетчики по 15-минутным интервалам. Дальше все считается векторно в
+NumPy: перцентили, раскладка по дням через границы суток в часовом поясе
+TIME_ZONE, накопленные итоги. Результат кэшируется по версиям проекта и
+его досок (project/cache.py), которые меняются при любом изменении задач.
+"""
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.db import connection
+from django.db.models import Case, Count, FloatField, Func, IntegerField, Value, When
+from django.db.models.functions import Cast, Floor
+from django.utils import timezone
+
+from column.models import Column
+from task.models import Task
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 365
+PERCENTILES = (50, 75, 85, 95)
+# Интервал агрегации в базе: сутки в любом часовом поясе делятся на него нацело
+BUCKET_SECONDS = 15 * 60
+
+
+class Epoch(Func):
+    """Момент времени в секундах Unix; NULL остается NULL"""
+    output_field = FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # julianday() разбирает сохраненную строку без Python-функций Django
+        return self.as_sql(compiler, connection, template='((julianday(%(expressions)s) - 2440587.5) * 86400.0)',
+                           **extra_context)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='EXTRACT(EPOCH FROM %(expressions)s)', **extra_context)
+
+
+def get_project_analytics(project_id, days=DEFAULT_DAYS):
+    today = timezone.localdate()
+    dates = [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+    start = timezone.make_aware(datetime.combine(dates[0], time.min))
+    # Границы суток: boundaries[i] — начало dates[i], последняя — конец сегодняшнего дня
+    boundaries = np.array([
+        timezone.make_aware(datetime.combine(day, time.min)).timestamp()
+        for day in [*dates, today + timedelta(days=1)]
+    ])
+
+    columns = list(
+        Column.objects.filter(board__project_id=project_id)
+        .select_related('board').order_by('board_id', 'order', 'id')
+    )
+    tasks = Task.objects.filter(column_id__in=[column.pk for column in columns]).order_by()
+
+    created_at, started_at, completed_at = _fetch_array(
+        tasks.filter(is_completed=True, completed_at__gte=start)
+        .values_list(Epoch('created_at'), Epoch('started_at'), Epoch('completed_at')),
+        width=3,
+    ).T
+
+    return {
+        'project_id': project_id,
+        'from': dates[0],
+        'to': today,
+        'cycle_time': _distribution(completed_at - started_at),
+        'lead_time': _distribution(completed_at - created_at),
+        'throughput': _throughput(completed_at, dates, boundaries),
+        'wip': _wip(tasks, columns),
+        'burndown': _burndown(tasks, columns, dates, start, boundaries),
+    }
+
+
+def _fetch_array(queryset, width):
+    """
+    Строки values_list() массивом float, NULL — nan. Курсор напрямую: на
+    сотнях тысяч строк конвертеры Django дороже самого запроса.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return np.array(cursor.fetchall(), dtype=float).reshape(-1, width)
+
+
+def _distribution(seconds):
+    """Перцентили длительности в секундах по задачам, где она известна"""
+    seconds = seconds[~np.isnan(seconds)]
+    seconds = np.maximum(seconds, 0)
+    if not seconds.size:
+        return {'count': 0, 'mean': None, **{f'p{p}': None for p in PERCENTILES}}
+
+    values = np.percentile(seconds, PERCENTILES)
+    return {
+        'count': int(seconds.size),
+        'mean': int(np.rint(seconds.mean())),
+        **{f'p{p}': int(value) for p, value in zip(PERCENTILES, np.rint(values))},
+    }
+
+
+def _per_day(moments, boundaries, weights=None):
+    """Сколько моментов попало в каждые сутки окна"""
+    index = np.searchsorted(boundaries, moments, side='right') - 1
+    inside = (index >= 0) & (index < len(boundaries) - 1)
+    return np.bincount(
+        index[inside], weights=None if weights is None else weights[inside], minlength=len(boundaries) - 1
+    ).astype(int)
+
+
+def _throughput(completed_at, dates, boundaries):
+    counts = _per_day(completed_at, boundaries)
+    return {
+        'total': int(counts.sum()),
+        'daily_mean': round(float(counts.mean()), 2),
+        'days': [{'date': day, 'completed': int(count)} for day, count in zip(dates, counts)],
+    }
+
+
+def _wip(tasks, columns):
+    open_counts = dict(
+        tasks.filter(is_completed=False).values('column_id')
+        .annotate(count=Count('pk')).values_list('column_id', 'count')
+    )
+    return [
+        {
+            'column_id': column.pk,
+            'column': column.name,
+            'board_id': column.board_id,
+            'board': column.board.name,
+            'tasks': open_counts.get(column.pk, 0),
+        }
+        for column in columns
+    ]
+
+
+def _bucket(field, start):
+    """Номер 15-минутного интервала от начала окна; все, что раньше окна, — -1"""
+    offset = (Epoch(field) - Value(start.timestamp())) / Value(float(BUCKET_SECONDS))
+    return Case(
+        When(**{f'{field}__lt': start}, then=Value(-1)),
+        default=Cast(Floor(offset), IntegerField()),  # CAST в PostgreSQL округляет, а не отбрасывает
+        output_field=IntegerField(),
+    )
+
+
+def _burndown(tasks, columns, dates, start, boundaries):
+    """
+    У досок нет дат спринта, поэтому burndown строится по тому же окну:
+    scope — задач на доске к концу дня, remaining — из них не выполнено.
+    """
+    boards = {column.board_id: column.board for column in columns if column.board.is_sprint}
+    if not boards:
+        return []
+    board_of_column = {column.pk: column.board_id for column in columns if column.board_id in boards}
+    sprint_tasks = tasks.filter(column_id__in=list(board_of_column))
+
+    def counts(queryset, field):
+        """{board_id: задач к концу каждого дня окна} по интервалам из базы"""
+        rows = _fetch_array(
+            queryset.annotate(bucket=_bucket(field, start)).values('column_id', 'bucket')
+            .annotate(count=Count('pk')).values_list('column_id', 'bucket', 'count'),
+            width=3,
+        )
+        board_ids = np.array([board_of_column[int(column_id)] for column_id in rows[:, 0]])
+        # Интервал -1 (до окна) попадает в первые сутки, сдвиг на полинтервала
+        # уводит момент с границы суток внутрь своих суток
+        moments = start.timestamp() + (np.maximum(rows[:, 1], 0) + 0.5) * BUCKET_SECONDS
+        return {
+            board_id: np.cumsum(_per_day(moments[board_ids == board_id], boundaries, rows[board_ids == board_id, 2]))
+            for board_id in boards
+        }
+
+    scope = counts(sprint_tasks, 'created_at')
+    done = counts(sprint_tasks.filter(is_completed=True), 'completed_at')
+
+    return [
+        {
+            'board_id': board_id,
+            'board': board.name,
+            'days': [
+                {'date': day, 'scope': int(total), 'remaining': int(total - closed)}
+                for day, total, closed in zip(dates, scope[board_id], done[board_id])
+            ],
+        }
+        for board_id, board in boards.items()
+    ]
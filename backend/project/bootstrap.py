@@ -0,0 +1,100 @@
+"""
+Создание проекта: сам проект, участники с ролями и стартовые элементы.
+
+Стартовые приоритеты, теги, доски и колонки — данные, а не код: JSON-шаблон
+PROJECT_TEMPLATE_PATH (по умолчанию project/project_template.json).
+Все записи идут одной транзакцией, каждая таблица — одним INSERT, поэтому
+создание проекта стоит несколько запросов независимо от размера шаблона.
+"""
+import json
+import random
+import string
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from board.models import Board
+from column.models import Column
+from priority.models import Priority
+from tag.models import Tag
+from .cache import bump_project_version
+from .membership import bump_memberships
+from .models import Project, ProjectMembers
+
+KEY_ALPHABET = string.ascii_uppercase + string.digits
+KEY_LENGTH = 6
+# Совпадение ключей случайно и редко: хватает нескольких попыток
+KEY_ATTEMPTS = 5
+# Роль владельца в проекте — лидер
+OWNER_ROLE_ID = 1
+
+
+@lru_cache(maxsize=None)
+def load_template(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def get_template():
+    return load_template(str(settings.PROJECT_TEMPLATE_PATH))
+
+
+def generate_key():
+    return ''.join(random.choices(KEY_ALPHABET, k=KEY_LENGTH))
+
+
+def create_project(owner, users, name, description='', template=None):
+    """Проект с участниками users (владелец среди них) и элементами шаблона"""
+    with transaction.atomic():
+        project = _create_with_unique_key(owner=owner, name=name, description=description)
+
+        # Роли сразу в INSERT: владелец — лидер, остальные — со своей ролью
+        ProjectMembers.objects.bulk_create([
+            ProjectMembers(project=project, user=user, role_id=OWNER_ROLE_ID if user.pk == owner.pk else user.role_id)
+            for user in users
+        ])
+        apply_template(project, template or get_template())
+
+        # bulk_create не отправляет сигналы, версии сбрасываем сами
+        bump_project_version(project.pk)
+        bump_memberships(*(user.pk for user in users))
+    return project
+
+
+def _create_with_unique_key(**fields):
+    # Уникальность ключа проверяет индекс: без SELECT перед каждой попыткой
+    for attempt in range(KEY_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                return Project.objects.create(key=generate_key(), **fields)
+        except IntegrityError:
+            if attempt == KEY_ATTEMPTS - 1:
+                raise
+
+
+def apply_template(project, template):
+    """
+    template: {'priorities': [{name, color, order}], 'tags': [{name, color}],
+    'boards': [{name, is_sprint, icon, columns: [название, ...]}]}.
+    Порядок приоритетов и колонок по умолчанию — порядок в списке.
+    """
+    Priority.objects.bulk_create([
+        Priority(project=project, is_default=True, **{'order': order, **item})
+        for order, item in enumerate(template.get('priorities', []))
+    ])
+    Tag.objects.bulk_create([
+        Tag(project=project, is_default=True, **item)
+        for item in template.get('tags', [])
+    ])
+
+    board_items = template.get('boards', [])
+    boards = Board.objects.bulk_create([
+        Board(project=project, **{key: value for key, value in item.items() if key != 'columns'})
+        for item in board_items
+    ])
+    Column.objects.bulk_create([
+        Column(board=board, name=column, order=order, is_default=True)
+        for board, item in zip(boards, board_items)
+        for order, column in enumerate(item.get('columns', []))
+    ])
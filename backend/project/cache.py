@@ -0,0 +1,44 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from core.versions import bump_versions, get_versions
+
+
+def get_project_versions(project_ids):
+    """Текущие версии проектов: {project_id: version}"""
+    return get_versions('project', project_ids)
+
+
+def bump_project_version(*project_ids):
+    """Отмечает изменение самого проекта, его участников, тегов, приоритетов или списка досок"""
+    bump_versions('project', *project_ids)
+
+
+ANALYTICS_KEY = 'project:{}:analytics:{}:{}:v{}:{}'
+
+
+def get_cached_analytics(project_id, days, build):
+    """
+    Аналитика проекта из кэша. Ключ включает версии проекта и его досок:
+    любое изменение задачи меняет версию доски, и старый результат не читается.
+    Дата в ключе сдвигает окно в полночь.
+    """
+    # Импорт здесь: board.models зависит от project.models
+    from board.cache import get_board_versions
+    from board.models import Board
+
+    cache = caches[settings.ANALYTICS_CACHE_ALIAS]
+    board_versions = get_board_versions(Board.objects.filter(project_id=project_id).values_list('pk', flat=True))
+    fingerprint = hashlib.md5(repr(sorted(board_versions.items())).encode()).hexdigest()
+    key = ANALYTICS_KEY.format(
+        project_id, timezone.localdate(), days, get_project_versions([project_id])[project_id], fingerprint
+    )
+
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, settings.ANALYTICS_CACHE_TIMEOUT)
+    return data
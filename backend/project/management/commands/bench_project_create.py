@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from authentication.models import User, UserRole
+from project.bootstrap import OWNER_ROLE_ID, create_project
+
+
+class Command(BaseCommand):
+    help = 'Нагрузочный тест создания проектов по шаблону в текущей базе (DATABASES["default"])'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1000, help='Сколько проектов создать')
+        parser.add_argument('--members', type=int, default=3, help='Участников кроме владельца')
+
+    def handle(self, *args, **options):
+        suffix = time.time_ns()
+        users = [
+            User.objects.create(email=f'bench-{suffix}-{index}@example.com', username=f'bench-{suffix}-{index}', role=None)
+            for index in range(options['members'] + 1)
+        ]
+        owner = users[0]
+        # В пустой базе ролей нет, а владелец получает роль лидера
+        role, role_created = UserRole.objects.get_or_create(pk=OWNER_ROLE_ID, defaults={'name': f'bench-{suffix}'})
+
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                create_project(owner, users, 'bench')
+            query_count = len(queries.captured_queries)
+
+            started = time.perf_counter()
+            for index in range(options['count'] - 1):
+                create_project(owner, users, f'bench {index}')
+            elapsed = time.perf_counter() - started
+        finally:
+            for user in users:
+                user.delete()  # каскадом удаляет проекты со всем содержимым
+            if role_created:
+                role.delete()
+
+        count = max(options['count'] - 1, 1)
+        self.stdout.write(f'База: {connection.vendor}, проектов: {options["count"]}, участников: {len(users)}')
+        self.stdout.write(f'Запросов на проект: {query_count}')
+        self.stdout.write(
+            f'Время: {elapsed:.2f} с, {elapsed / count * 1000:.2f} мс на проект, {count / elapsed:.0f} проектов/с'
+        )
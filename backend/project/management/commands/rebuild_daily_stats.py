@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from project.models import Project
+from project.stats import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Заново строит дневную статистику проектов по истории задач (пачками проектов)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', dest='projects', help='Только этот проект')
+        parser.add_argument('--batch-size', type=int, default=100, help='Проектов в одной транзакции')
+
+    def handle(self, *args, **options):
+        project_ids = Project.objects.order_by('pk').values_list('pk', flat=True)
+        if options['projects']:
+            project_ids = project_ids.filter(pk__in=options['projects'])
+        project_ids = list(project_ids)
+
+        batch_size = max(options['batch_size'], 1)
+        total = 0
+        for start in range(0, len(project_ids), batch_size):
+            total += rebuild(project_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'Проектов: {len(project_ids)}, дней: {total}'))
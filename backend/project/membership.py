@@ -0,0 +1,50 @@
+"""
+Участие пользователя в проектах: {project_id: role_id}.
+
+Читается одним запросом к ProjectMembers по пользователю, хранится в общем
+кэше под версией пользователя (core/versions.py) и на время запроса — в
+самом запросе, поэтому повторные проверки доступа в одном запросе не
+обращаются ни к базе, ни к кэшу. Изменения ProjectMembers через модель
+переводят пользователя на новую версию в project/signals.py; записи в обход
+сигналов (bulk_create, update()) вызывают bump_memberships сами.
+"""
+from django.conf import settings
+from django.core.cache import caches
+
+from core.versions import bump_versions, get_versions
+from .models import ProjectMembers
+
+MEMBERSHIPS_KEY = 'user:{}:v{}:memberships'
+# Атрибут запроса с уже загруженным участием
+REQUEST_ATTR = '_project_memberships'
+
+
+def get_memberships(user_id):
+    """Проекты пользователя с его ролью в каждом: {project_id: role_id}"""
+    cache = caches[settings.MEMBERSHIP_CACHE_ALIAS]
+    version = get_versions('memberships', [user_id])[user_id]
+    key = MEMBERSHIPS_KEY.format(user_id, version)
+
+    memberships = cache.get(key)
+    if memberships is None:
+        memberships = dict(ProjectMembers.objects.filter(user_id=user_id).values_list('project_id', 'role_id'))
+        cache.set(key, memberships, settings.MEMBERSHIP_CACHE_TIMEOUT)
+    return memberships
+
+
+def get_request_memberships(request):
+    """get_memberships для пользователя запроса, один раз за запрос; у анонима проектов нет"""
+    user = request.user
+    if not user.is_authenticated:
+        return {}
+
+    cached = getattr(request, REQUEST_ATTR, None)
+    if cached is None or cached[0] != user.pk:
+        cached = (user.pk, get_memberships(user.pk))
+        setattr(request, REQUEST_ATTR, cached)
+    return cached[1]
+
+
+def bump_memberships(*user_ids):
+    """Сбрасывает закэшированное участие пользователей"""
+    bump_versions('memberships', *user_ids)
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:30
+
+import random
+import string
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def deduplicate_keys(apps, schema_editor):
+    # Перед уникальным ограничением: пустые ключи становятся NULL,
+    # повторяющиеся (кроме первого проекта) получают новые
+    Project = apps.get_model('project', 'Project')
+    Project.objects.filter(key='').update(key=None)
+
+    taken = set(Project.objects.exclude(key=None).values_list('key', flat=True))
+    duplicates = Project.objects.values('key').annotate(total=Count('id')).filter(total__gt=1).exclude(key=None)
+    for duplicate in duplicates:
+        projects = Project.objects.filter(key=duplicate['key']).order_by('id')[1:]
+        for project in projects:
+            key = duplicate['key']
+            while key in taken:
+                key = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+            taken.add(key)
+            project.key = key
+            project.save(update_fields=['key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0003_project_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='project',
+            name='key',
+            field=models.CharField(blank=True, max_length=10, null=True, unique=True, verbose_name='Уникальный ключ'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0004_alter_project_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='День')),
+                ('created', models.PositiveIntegerField(default=0, verbose_name='Создано задач')),
+                ('started', models.PositiveIntegerField(default=0, verbose_name='Начато задач')),
+                ('submitted', models.PositiveIntegerField(default=0, verbose_name='Отправлено на проверку')),
+                ('completed', models.PositiveIntegerField(default=0, verbose_name='Выполнено задач')),
+                ('tracked_seconds', models.PositiveBigIntegerField(default=0, verbose_name='Учтено секунд')),
+                ('open_tasks', models.JSONField(default=dict, verbose_name='Открытые задачи по колонкам')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='project.project', verbose_name='Проект')),
+            ],
+            options={
+                'verbose_name': 'Статистика проекта за день',
+                'verbose_name_plural': 'Статистика проектов по дням',
+                'ordering': ['date'],
+                'constraints': [models.UniqueConstraint(fields=('project', 'date'), name='projectdailystats_project_date_uniq')],
+            },
+        ),
+    ]
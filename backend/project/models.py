@@ -4,7 +4,7 @@ from authentication.models import User, UserRole
 class Project(models.Model):
     name = models.CharField(verbose_name='Название', max_length=100)
     description = models.TextField(verbose_name='Описание', blank=True, null=True)
-    key = models.CharField(verbose_name='Уникальный ключ', max_length=10, blank=True, null=True)
+    key = models.CharField(verbose_name='Уникальный ключ', max_length=10, blank=True, null=True, unique=True)
     owner = models.ForeignKey(User, verbose_name='Владелец', on_delete=models.CASCADE, related_name='owned_projects')
     members = models.ManyToManyField(User, verbose_name='Участники', through='ProjectMembers', related_name='projects')
     created_at = models.DateTimeField(verbose_name='Создан', auto_now_add=True)
@@ -36,4 +36,26 @@ class ProjectBasedModel(models.Model):
     is_default = models.BooleanField(default=False)  # Флаг для базовых элементов
     
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+class ProjectDailyStats(models.Model):
+    """Сводка проекта за день: счетчики событий задач и открытые задачи по колонкам"""
+    project = models.ForeignKey(Project, verbose_name='Проект', on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField(verbose_name='День')
+    created = models.PositiveIntegerField(verbose_name='Создано задач', default=0)
+    started = models.PositiveIntegerField(verbose_name='Начато задач', default=0)
+    submitted = models.PositiveIntegerField(verbose_name='Отправлено на проверку', default=0)
+    completed = models.PositiveIntegerField(verbose_name='Выполнено задач', default=0)
+    tracked_seconds = models.PositiveBigIntegerField(verbose_name='Учтено секунд', default=0)
+    # {column_id: открытых задач} на конец дня; хранится снимок последнего изменения за день
+    open_tasks = models.JSONField(verbose_name='Открытые задачи по колонкам', default=dict)
+
+    def __str__(self):
+        return f"{self.project} — {self.date}"
+
+    class Meta:
+        verbose_name = 'Статистика проекта за день'
+        verbose_name_plural = 'Статистика проектов по дням'
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'date'], name='projectdailystats_project_date_uniq'),
+        ]
@@ -0,0 +1,44 @@
+from django.db.models import F
+from rest_framework.permissions import IsAuthenticated
+
+from .membership import get_request_memberships
+
+# Аннотация с id проекта объекта: проверка доступа не ходит по связям
+PROJECT_ANNOTATION = 'member_project_id'
+
+
+def get_object_project_id(obj, lookup):
+    """Id проекта объекта по пути lookup ('column__board__project_id')"""
+    value = getattr(obj, PROJECT_ANNOTATION, None)
+    if value is not None:
+        return value
+    *path, field = lookup.split('__')
+    for name in path:
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return None
+    return getattr(obj, field, None)
+
+
+class IsProjectMember(IsAuthenticated):
+    """Объект доступен только участникам его проекта; путь к проекту — view.project_lookup"""
+
+    def has_object_permission(self, request, view, obj):
+        return get_object_project_id(obj, view.project_lookup) in get_request_memberships(request)
+
+
+class ProjectScopedMixin:
+    """
+    ViewSet объектов проекта: список и поиск объекта — только в проектах
+    пользователя, без JOIN с участниками. project_lookup — путь от модели
+    к id проекта.
+    """
+    permission_classes = [IsProjectMember]
+    project_lookup = None
+
+    def get_queryset(self):
+        return self.scope_to_projects(super().get_queryset(), self.project_lookup)
+
+    def scope_to_projects(self, queryset, lookup):
+        project_ids = list(get_request_memberships(self.request))
+        return queryset.filter(**{f'{lookup}__in': project_ids}).annotate(**{PROJECT_ANNOTATION: F(lookup)})
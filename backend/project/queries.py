@@ -0,0 +1,29 @@
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+
+from board.models import Board
+from task.models import Task
+from .models import ProjectMembers
+
+
+def _count_subquery(queryset, project_field):
+    counts = queryset.filter(**{project_field: OuterRef('pk')}).order_by().values(project_field)
+    counts = counts.annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def with_project_summary(queryset):
+    """
+    Сводка по проектам для списка: доски без содержимого, число открытых и
+    закрытых задач и участников. Счетчики считаются подзапросами, чтобы
+    соединения не размножали строки.
+    """
+    tasks = Task.objects.all()
+
+    return queryset.annotate(
+        open_tasks=_count_subquery(tasks.filter(is_completed=False), 'column__board__project'),
+        closed_tasks=_count_subquery(tasks.filter(is_completed=True), 'column__board__project'),
+        member_count=_count_subquery(ProjectMembers.objects.all(), 'project'),
+    ).prefetch_related(
+        Prefetch('boards', queryset=Board.objects.only('id', 'project_id', 'name', 'is_sprint', 'icon')),
+    )
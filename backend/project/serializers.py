@@ -1,16 +1,17 @@
 from rest_framework import serializers
-from .models import Project, ProjectMembers
+from core.serializers import SparseFieldsMixin
+from .models import Project, ProjectDailyStats, ProjectMembers
 from board.models import Board
 from tag.models import Tag
 from priority.models import Priority
 
-from board.serializers import BoardSerializer
+from board.serializers import BoardSummarySerializer, serialize_boards
 from tag.serializers import TagSerializer
 from priority.serializers import PrioritySerializer
 from authentication.serializers import UserSerializer, UserRoleSerializer
 
 
-class ProjectMembersSerializer(serializers.ModelSerializer):
+class ProjectMembersSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer()
     role = UserRoleSerializer()
 
@@ -19,7 +20,7 @@ class ProjectMembersSerializer(serializers.ModelSerializer):
         fields = ['user', 'role', 'joined_at']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     boards = serializers.SerializerMethodField()
     tags = serializers.SerializerMethodField()
     priorities = serializers.SerializerMethodField()
@@ -30,8 +31,8 @@ class ProjectSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'key', 'created_at', 'owner', 'boards', 'members', 'tags', 'priorities']
 
     def get_boards(self, obj):
-        boards = Board.objects.filter(project=obj)
-        return BoardSerializer(boards, many=True, context=self.context).data
+        board_ids = Board.objects.filter(project=obj).values_list('pk', flat=True)
+        return serialize_boards(board_ids, self.context.get('request'))
 
     def get_tags(self, obj):
         tags = Tag.objects.filter(project=obj)
@@ -45,6 +46,20 @@ class ProjectSerializer(serializers.ModelSerializer):
         members = ProjectMembers.objects.filter(project=obj).select_related('user', 'role')
         return ProjectMembersSerializer(members, many=True).data
 
+class ProjectSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Облегченное представление проекта для списка (?view=summary)"""
+    boards = BoardSummarySerializer(many=True, read_only=True)
+    open_tasks = serializers.IntegerField(read_only=True)
+    closed_tasks = serializers.IntegerField(read_only=True)
+    member_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Project
+        fields = [
+            'id', 'name', 'description', 'key', 'created_at', 'owner',
+            'boards', 'open_tasks', 'closed_tasks', 'member_count'
+        ]
+
 class ProjectCreateSerializer(serializers.ModelSerializer):
     members = serializers.ListField(
         child=serializers.IntegerField(),
@@ -59,4 +74,10 @@ class ProjectCreateSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             'owner': {'read_only': True},
             'key': {'read_only': True}
-        }
\ No newline at end of file
+        }
+
+
+class ProjectDailyStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProjectDailyStats
+        fields = ['date', 'created', 'started', 'submitted', 'completed', 'tracked_seconds', 'open_tasks']
@@ -0,0 +1,50 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from authentication.models import User
+from board.models import Board
+from priority.models import Priority
+from tag.models import Tag
+from .cache import bump_project_version
+from .membership import bump_memberships
+from .models import Project, ProjectMembers
+
+
+@receiver([post_save, post_delete], sender=Project)
+def project_changed(sender, instance, **kwargs):
+    bump_project_version(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ProjectMembers)
+def membership_changed(sender, instance, **kwargs):
+    bump_memberships(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=ProjectMembers)
+@receiver([post_save, post_delete], sender=Board)
+@receiver([post_save, post_delete], sender=Tag)
+@receiver([post_save, post_delete], sender=Priority)
+def project_part_changed(sender, instance, **kwargs):
+    bump_project_version(instance.project_id)
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def project_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        bump_project_version(*ProjectMembers.objects.filter(user=instance).values_list('project_id', flat=True))
+        bump_project_version(*(pk_set or []))
+        bump_memberships(instance.pk)
+    else:
+        bump_project_version(instance.pk)
+        # add() пишет через bulk_create без post_save; remove() и clear()
+        # удаляют строки с post_delete, и участие сбрасывает membership_changed
+        bump_memberships(*(pk_set or []))
+
+
+@receiver(post_save, sender=User)
+def member_profile_changed(sender, instance, created, **kwargs):
+    # Имя, фото и роль участника выводятся в составе проекта
+    if not created:
+        bump_project_version(*ProjectMembers.objects.filter(user=instance).values_list('project_id', flat=True))
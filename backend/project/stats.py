@@ -0,0 +1,139 @@
+"""
+Дневная сводка проекта (ProjectDailyStats) для дашбордов.
+
+Счетчики дня увеличиваются выражением F() в момент события — создания,
+начала работы, отправки на проверку, выполнения задачи, остановки таймера.
+Открытые задачи хранит счетчик колонки (Column.open_tasks): создание,
+перенос, выполнение и удаление задачи меняют его через F(), а в сводку дня
+записывается снимок счетчиков колонок проекта. Полный пересчет по задачам
+и историю делает только команда rebuild_daily_stats.
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from column.models import Column
+from task.models import Task, TimeEntry
+from .models import ProjectDailyStats
+
+COUNTERS = ('created', 'started', 'submitted', 'completed', 'tracked_seconds')
+
+
+def project_id_for_column(column_id):
+    return Column.objects.filter(pk=column_id).values_list('board__project_id', flat=True).first()
+
+
+def record(project_id, moment=None, open_tasks=None, **amounts):
+    """
+    Прибавляет к счетчикам дня moment (по умолчанию сегодня): record(1, completed=1).
+    open_tasks — изменения открытых задач в колонках проекта: {column_id: +1 или -1}
+    """
+    if project_id is None:
+        return
+    unknown = set(amounts) - set(COUNTERS)
+    if unknown:
+        raise ValueError(f'Неизвестные счетчики: {", ".join(sorted(unknown))}')
+    amounts = {name: amount for name, amount in amounts.items() if amount}
+    if amounts:
+        _update_day(project_id, timezone.localdate(moment), **{name: F(name) + amount for name, amount in amounts.items()})
+
+    open_tasks = {column_id: delta for column_id, delta in (open_tasks or {}).items() if column_id and delta}
+    if open_tasks:
+        for column_id, delta in open_tasks.items():
+            # Не ниже нуля: два параллельных выполнения одной задачи уменьшат счетчик дважды
+            Column.objects.filter(pk=column_id).update(open_tasks=Greatest(F('open_tasks') + delta, 0))
+        _snapshot_open_tasks(project_id)
+
+
+def move_open_task(from_column_id=None, to_column_id=None):
+    """Открытая задача ушла из колонки from_column_id и/или появилась в to_column_id"""
+    if from_column_id == to_column_id:
+        return
+    columns = {from_column_id: -1, to_column_id: 1}
+    columns.pop(None, None)
+    changes = defaultdict(dict)
+    for column_id, project_id in Column.objects.filter(pk__in=list(columns)).values_list('pk', 'board__project_id'):
+        changes[project_id][column_id] = columns[column_id]
+    for project_id, open_tasks in changes.items():
+        record(project_id, open_tasks=open_tasks)
+
+
+def _snapshot_open_tasks(project_id):
+    """Записывает в сводку сегодняшнего дня счетчики колонок проекта"""
+    snapshot = {
+        str(column_id): count
+        for column_id, count in Column.objects.filter(board__project_id=project_id).values_list('id', 'open_tasks')
+    }
+    _update_day(project_id, timezone.localdate(), open_tasks=snapshot)
+
+
+def rebuild(project_ids):
+    """
+    Пересчитывает сводку проектов по истории задач и записей времени.
+    История колонок не хранится, поэтому снимок открытых задач есть только
+    у сегодняшнего дня; отправка на проверку и выполнение учитываются
+    один раз, по первым submitted_at и completed_at.
+    """
+    project_ids = list(project_ids)
+    days = defaultdict(dict)
+
+    tasks = Task.objects.filter(column__board__project_id__in=project_ids).order_by()
+    for counter, field, filters in [
+        ('created', 'created_at', {}),
+        ('started', 'started_at', {}),
+        ('submitted', 'submitted_at', {}),
+        ('completed', 'completed_at', {'is_completed': True}),
+    ]:
+        rows = (
+            tasks.filter(**{f'{field}__isnull': False}, **filters)
+            .annotate(day=TruncDate(field)).values('column__board__project_id', 'day')
+            .annotate(amount=Count('pk')).values_list('column__board__project_id', 'day', 'amount')
+        )
+        for project_id, day, amount in rows:
+            days[project_id, day][counter] = amount
+
+    entries = (
+        TimeEntry.objects.filter(project_id__in=project_ids, ended_at__isnull=False).order_by()
+        .annotate(day=TruncDate('ended_at')).values('project_id', 'day')
+        .annotate(amount=Sum('duration')).values_list('project_id', 'day', 'amount')
+    )
+    for project_id, day, amount in entries:
+        days[project_id, day]['tracked_seconds'] = amount
+
+    with transaction.atomic():
+        ProjectDailyStats.objects.filter(project_id__in=project_ids).delete()
+        ProjectDailyStats.objects.bulk_create([
+            ProjectDailyStats(project_id=project_id, date=day, **counters)
+            for (project_id, day), counters in days.items()
+        ], batch_size=1000)
+        _recount_open_tasks(project_ids)
+    return len(days)
+
+
+def _recount_open_tasks(project_ids):
+    """Пересчитывает счетчики открытых задач колонок проектов по задачам"""
+    columns = list(Column.objects.filter(board__project_id__in=project_ids).only('pk'))
+    counts = dict(
+        Task.objects.filter(column__in=columns, is_completed=False).order_by()
+        .values('column_id').annotate(count=Count('pk')).values_list('column_id', 'count')
+    )
+    for column in columns:
+        column.open_tasks = counts.get(column.pk, 0)
+    Column.objects.bulk_update(columns, ['open_tasks'], batch_size=1000)
+    for project_id in project_ids:
+        _snapshot_open_tasks(project_id)
+
+
+def _update_day(project_id, day, **updates):
+    rows = ProjectDailyStats.objects.filter(project_id=project_id, date=day)
+    if rows.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            ProjectDailyStats.objects.create(project_id=project_id, date=day)
+    except IntegrityError:
+        pass  # строку дня только что создал параллельный запрос
+    rows.update(**updates)
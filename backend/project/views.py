@@ -1,149 +1,104 @@
 from rest_framework.viewsets import ModelViewSet
+from core.pagination import ProjectMembersPagination
 from rest_framework.permissions import IsAuthenticated
 
 from .models import Project, ProjectMembers
 from board.models import Board
-from .serializers import ProjectMembersSerializer, ProjectSerializer, ProjectCreateSerializer
-from board.serializers import BoardSerializer
-from priority.models import Priority
-from tag.models import Tag
+from .serializers import (
+    ProjectDailyStatsSerializer, ProjectMembersSerializer, ProjectSerializer, ProjectCreateSerializer,
+    ProjectSummarySerializer,
+)
+from .queries import with_project_summary
+from .cache import bump_project_version, get_cached_analytics, get_project_versions
+from .membership import bump_memberships, get_request_memberships
+from . import bootstrap
+from .analytics import DEFAULT_DAYS, MAX_DAYS, get_project_analytics
+from board.cache import get_board_versions
+from core.etag import ConditionalGetMixin
+from board.serializers import serialize_boards
 from board.models import Board
-from column.models import Column
 
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
-import random
-import string
+from rest_framework.exceptions import ParseError
+from django.utils import timezone
+from datetime import timedelta
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 User = get_user_model()
 
-class ProjectViewSet(ModelViewSet):
+class ProjectViewSet(ConditionalGetMixin, ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
     queryset = Project.objects.none()
 
     def get_queryset(self):
-        queryset = Project.objects.filter(members=self.request.user)
+        # Проекты пользователя из закэшированного участия, без JOIN с участниками
+        queryset = Project.objects.filter(pk__in=list(get_request_memberships(self.request)))
         
         if self.action == 'list':
             queryset = queryset.order_by('-created_at')
+
+            if self.is_summary_view():
+                queryset = with_project_summary(queryset)
         
         return queryset
 
     def get_serializer_class(self):
         if self.action == 'create_project':
             return ProjectCreateSerializer
+        if self.action == 'list' and self.is_summary_view():
+            return ProjectSummarySerializer
         return super().get_serializer_class()
+
+    def get_list_fingerprint(self):
+        project_ids = list(self.filter_queryset(self.get_queryset()).values_list('pk', flat=True))
+        return self.get_projects_fingerprint(project_ids)
+
+    def get_object_fingerprint(self):
+        return self.get_projects_fingerprint([self.get_object().pk])
+
+    def get_projects_fingerprint(self, project_ids):
+        # Проект меняется вместе со своими досками, поэтому учитываем и их версии
+        board_ids = Board.objects.filter(project_id__in=project_ids).values_list('pk', flat=True)
+        return (
+            sorted(get_project_versions(project_ids).items()),
+            sorted(get_board_versions(board_ids).items()),
+        )
+
+    def is_summary_view(self):
+        # ?view=summary — сводка без содержимого досок для переключателя проектов
+        return self.request.query_params.get('view') == 'summary'
     
     @action(detail=False, methods=['POST'], url_path='create-project')
     def create_project(self, request):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        key = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        while Project.objects.filter(key=key).exists():
-            key = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-
-        project = Project.objects.create(
-            name=serializer.validated_data['name'],
-            description=serializer.validated_data.get('description', ''),
-            owner=request.user,
-            key=key
-        )
-
         member_ids = serializer.validated_data.get('members', [])
 
         if request.user.id not in member_ids:
             member_ids.append(request.user.id)
 
-        users = User.objects.filter(id__in=member_ids)
-        if users.count() != len(set(member_ids)):
-            existing_ids = set(users.values_list('id', flat=True))
-            invalid_ids = set(member_ids) - existing_ids
+        # Участники проверяются до записи: при ошибке проект не создается
+        users = list(User.objects.filter(id__in=member_ids))
+        if len(users) != len(set(member_ids)):
+            invalid_ids = set(member_ids) - {user.id for user in users}
             return Response(
                 {"detail": f"Не найдены пользователи с ID: {', '.join(map(str, invalid_ids))}"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        project.members.add(*users)
-
-        for user in users:
-            role_id = 1 if user == request.user else user.role_id
-            ProjectMembers.objects.filter(project=project, user=user).update(role_id=role_id)
-
-        self.create_default_project_elements(project)
-
-
-        return Response(ProjectSerializer(project).data, status=status.HTTP_201_CREATED)
-    
-    def create_default_project_elements(self, project):
-        default_priorities = [
-            {'name': 'Низкий', 'color': '#4CAF50', 'order': 0},
-            {'name': 'Средний', 'color': '#FFC107', 'order': 1},
-            {'name': 'Высокий', 'color': '#FF9800', 'order': 2},
-            {'name': 'Критический', 'color': '#F44336', 'order': 3},
-        ]
-        
-        for priority in default_priorities:
-            Priority.objects.create(
-                project=project,
-                name=priority['name'],
-                color=priority['color'],
-                order=priority['order'],
-                is_default=True
-            )
-
-        default_tags = [
-            {'name': 'Фронтенд', 'color': '#2196F3'},
-            {'name': 'Бэкенд', 'color': '#673AB7'},
-            {'name': 'Тестирование', 'color': '#009688'},
-            {'name': 'Дизайн', 'color': '#E91E63'},
-        ]
-        
-        for tag in default_tags:
-            Tag.objects.create(
-                project=project,
-                name=tag['name'],
-                color=tag['color'],
-                is_default=True
-            )
-
-        sprint_board = Board.objects.create(
-            project=project,
-            name='Спринт',
-            is_sprint=True,
-            icon='fxemoji:smallorangediamond'
-        )
-
-        default_columns = [
-            {'name': 'Новые', 'order': 0},
-            {'name': 'В работе', 'order': 1},
-            {'name': 'На проверке', 'order': 2},
-            {'name': 'Выполнено', 'order': 3},
-        ]
-        
-        for column in default_columns:
-            Column.objects.create(
-                board=sprint_board,
-                name=column['name'],
-                order=column['order'],
-                is_default=True
-            )
-
-        general_board = Board.objects.create(
-            project=project,
-            name='Общая доска'
+        # Проект, участники с ролями и элементы шаблона — одной транзакцией
+        project = bootstrap.create_project(
+            owner=request.user,
+            users=users,
+            name=serializer.validated_data['name'],
+            description=serializer.validated_data.get('description', ''),
         )
 
-        for column in default_columns:
-            Column.objects.create(
-                board=general_board,
-                name=column['name'],
-                order=column['order'],
-                is_default=True
-            )
+        return Response(ProjectSerializer(project).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['POST'], url_path='update-members')
     def update_members(self, request, pk=None):
@@ -188,6 +143,8 @@ class ProjectViewSet(ModelViewSet):
             )
         
         ProjectMembers.objects.filter(project=project, user=user).update(role_id=1)
+        bump_project_version(project.pk)
+        bump_memberships(user.pk)
         
         project.refresh_from_db()
         return Response(ProjectSerializer(project).data, status=status.HTTP_200_OK)
@@ -208,6 +165,8 @@ class ProjectViewSet(ModelViewSet):
         user_role_id = user.role_id
         
         ProjectMembers.objects.filter(project=project, user=user).update(role_id=user_role_id)
+        bump_project_version(project.pk)
+        bump_memberships(user.pk)
         
         project.refresh_from_db()
         return Response(ProjectSerializer(project).data, status=status.HTTP_200_OK)
@@ -248,14 +207,41 @@ class ProjectViewSet(ModelViewSet):
 
         project = Project.objects.get(pk=pk)
         
-        boards = Board.objects.filter(project=project)
-        serializer = BoardSerializer(boards, many=True, context={'request': request})
+        board_ids = Board.objects.filter(project=project).values_list('pk', flat=True)
         
         return Response({
             'project_id': pk,
-            'boards': serializer.data
+            'boards': serialize_boards(board_ids, request)
         }, status=status.HTTP_200_OK)
     
+    def get_days_param(self):
+        """Окно ?days= для аналитики и сводки: от 1 до MAX_DAYS"""
+        try:
+            days = int(self.request.query_params.get('days', DEFAULT_DAYS))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= MAX_DAYS:
+            raise ParseError(f"days должен быть числом от 1 до {MAX_DAYS}")
+        return days
+
+    @action(detail=True, methods=['GET'], url_path='analytics')
+    def analytics(self, request, pk=None):
+        project = self.get_object()
+        days = self.get_days_param()
+
+        data = get_cached_analytics(project.pk, days, lambda: get_project_analytics(project.pk, days))
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['GET'], url_path='daily-stats')
+    def daily_stats(self, request, pk=None):
+        """Дневная сводка проекта за последние ?days= дней (см. project/stats.py)"""
+        project = self.get_object()
+        days = self.get_days_param()
+
+        since = timezone.localdate() - timedelta(days=days - 1)
+        rows = project.daily_stats.filter(date__gte=since)
+        return Response(ProjectDailyStatsSerializer(rows, many=True).data, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['POST'], url_path='add-member-by-key')
     def add_member_by_key(self, request):
         key = request.data.get('key')  # Ключ проекта
@@ -290,4 +276,5 @@ class ProjectViewSet(ModelViewSet):
     
 class ProjectMembersViewSet(ModelViewSet):
     serializer_class = ProjectMembersSerializer
-    queryset = ProjectMembers.objects.all()
\ No newline at end of file
+    pagination_class = ProjectMembersPagination
+    queryset = ProjectMembers.objects.select_related('user__role', 'role')
\ No newline at end of file
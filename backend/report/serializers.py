@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from core.serializers import SparseFieldsMixin
 from .models import Report
 from authentication.serializers import UserSerializer
 
-class ReportSerializer(serializers.ModelSerializer):
+class ReportSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     
     class Meta:
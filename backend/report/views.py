@@ -1,9 +1,13 @@
 from rest_framework.viewsets import ModelViewSet
 
+from core.pagination import ReportPagination
+from project.permissions import ProjectScopedMixin
 from .models import Report
 from .serializers import ReportSerializer
 
 
-class ReportViewSet(ModelViewSet):
+class ReportViewSet(ProjectScopedMixin, ModelViewSet):
+    project_lookup = 'task__column__board__project_id'
     serializer_class = ReportSerializer
-    queryset = Report.objects.all()
\ No newline at end of file
+    pagination_class = ReportPagination
+    queryset = Report.objects.select_related('author__role')
\ No newline at end of file
@@ -0,0 +1,356 @@
+"""
+Пакетные операции над задачами: создание, изменение и удаление сотен задач
+одним запросом (POST /task/bulk/).
+
+Каждая операция проверяется отдельно, ошибки возвращаются по индексам, а
+корректные операции применяются. Связи всего пакета проверяются одним
+запросом на модель и только в пределах проектов пользователя: колонка —
+проекта, в котором он участник, исполнитель — участник того же проекта,
+приоритет и теги — того же проекта. Запись — bulk_create / bulk_update,
+поэтому сигналы моделей не срабатывают: версии досок, надгробия,
+поисковые документы, статистика и события досок обновляются здесь же.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from board import events
+from board.cache import bump_board_version
+from board.changes import record_deletion
+from board.events import send_board_events, task_delta
+from board.models import Tombstone
+from column.models import Column
+from project import stats
+from .models import Task
+from .ranking import rank_sequence_after
+from .references import TaskReferences
+from .search import build_documents
+from .serializers import BulkTaskSerializer
+
+MAX_OPERATIONS = 500
+OPERATIONS = ('create', 'update', 'delete')
+
+# Поля, изменение которых меняет поисковый документ задачи
+SEARCH_FIELDS = {'title', 'description', 'column_id'}
+
+
+class BulkError(Exception):
+    """Запрос целиком не подходит под формат пакета"""
+
+
+def apply_bulk(user, payload):
+    """
+    payload: {'create': [...], 'update': [...], 'delete': [id, ...]}.
+    Возвращает {'created': [{'index', 'id'}], 'updated': [id], 'deleted': [id], 'errors': [...]}.
+    """
+    if not isinstance(payload, dict):
+        raise BulkError('Ожидается объект с ключами create, update, delete')
+    creates = payload.get('create') or []
+    updates = payload.get('update') or []
+    deletes = payload.get('delete') or []
+    if not all(isinstance(value, list) for value in (creates, updates, deletes)):
+        raise BulkError('create, update и delete должны быть списками')
+    if len(creates) + len(updates) + len(deletes) > MAX_OPERATIONS:
+        raise BulkError(f'Не больше {MAX_OPERATIONS} операций за запрос')
+
+    errors = []
+
+    def fail(operation, index, detail):
+        errors.append({'operation': operation, 'index': index, 'errors': detail})
+
+    creates = _validate('create', creates, fail)
+    updates = _validate('update', updates, fail)
+    delete_ids = []
+    for index, task_id in enumerate(deletes):
+        if isinstance(task_id, int) and not isinstance(task_id, bool):
+            delete_ids.append((index, task_id))
+        else:
+            fail('delete', index, {'id': ['Ожидается id задачи']})
+
+    refs = _load_references(user, creates, updates, delete_ids)
+
+    creates = [(index, data) for index, data in creates if _check_create(refs, index, data, fail)]
+    updates = _check_updates(refs, updates, {task_id for _, task_id in delete_ids}, fail)
+    deleted = []
+    for index, task_id in delete_ids:
+        if task_id in refs['tasks']:
+            deleted.append(refs['tasks'][task_id])
+        else:
+            fail('delete', index, {'id': ['Задача не найдена']})
+
+    with transaction.atomic():
+        changes = _Changes()
+        created = _create(refs, creates, changes)
+        updated = _update(refs, updates, changes)
+        _delete(deleted, changes)
+        changes.apply()
+
+    errors.sort(key=lambda error: (OPERATIONS.index(error['operation']), error['index']))
+    return {
+        'created': created,
+        'updated': [task.pk for task in updated],
+        'deleted': [task.pk for task in deleted],
+        'errors': errors,
+    }
+
+
+def _validate(operation, items, fail):
+    # Один экземпляр на весь пакет: поля ModelSerializer строятся один раз
+    serializer = BulkTaskSerializer(partial=operation == 'update')
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            data = serializer.run_validation(item)
+        except ValidationError as e:
+            fail(operation, index, e.detail)
+            continue
+        required = 'id' if operation == 'update' else 'column_id'
+        if data.get(required) is None:
+            fail(operation, index, {required: ['Обязательное поле.']})
+            continue
+        valid.append((index, data))
+    return valid
+
+
+def _load_references(user, creates, updates, delete_ids):
+    """Все объекты, на которые ссылается пакет: по одному запросу на модель"""
+    items = [data for _, data in creates + updates]
+    task_ids = {data['id'] for _, data in updates} | {task_id for _, task_id in delete_ids}
+
+    tasks = Task.objects.filter(pk__in=task_ids, column__board__project__members=user).annotate(
+        board_id=F('column__board_id'), project_id=F('column__board__project_id'),
+    )
+    columns = Column.objects.filter(
+        pk__in={data['column_id'] for data in items if 'column_id' in data},
+        board__project__members=user,
+    ).values_list('pk', 'board_id', 'board__project_id')
+    tasks = {task.pk: task for task in tasks}
+    columns = {column_id: (board_id, project_id) for column_id, board_id, project_id in columns}
+
+    # Задачи с тегами: при переносе в другой проект теги нужно заменить
+    updated_ids = [data['id'] for _, data in updates if data['id'] in tasks]
+    tagged = set(Task.tags.through.objects.filter(task_id__in=updated_ids).values_list('task_id', flat=True)) if updated_ids else set()
+
+    project_ids = {project_id for _, project_id in columns.values()} | {task.project_id for task in tasks.values()}
+    return {
+        'tasks': tasks,
+        'columns': columns,
+        'tagged': tagged,
+        'related': TaskReferences(items, project_ids),
+    }
+
+
+def _check_create(refs, index, data, fail):
+    if data['column_id'] not in refs['columns']:
+        fail('create', index, {'column_id': ['Колонка не найдена']})
+        return False
+    _, project_id = refs['columns'][data['column_id']]
+    detail = refs['related'].errors(data, project_id)
+    if detail:
+        fail('create', index, detail)
+    return not detail
+
+
+def _check_updates(refs, updates, delete_ids, fail):
+    checked = []
+    seen = set()
+    for index, data in updates:
+        task = refs['tasks'].get(data['id'])
+        if task is None:
+            fail('update', index, {'id': ['Задача не найдена']})
+            continue
+        if task.pk in seen or task.pk in delete_ids:
+            fail('update', index, {'id': ['Задача уже есть в пакете']})
+            continue
+
+        project_id = task.project_id
+        if 'column_id' in data:
+            if data['column_id'] not in refs['columns']:
+                fail('update', index, {'column_id': ['Колонка не найдена']})
+                continue
+            _, project_id = refs['columns'][data['column_id']]
+            if project_id != task.project_id and not _keeps_references(data, task, refs['tagged']):
+                fail('update', index, {'column_id': ['При переносе в другой проект укажите исполнителя, '
+                                                     'приоритет и теги этого проекта']})
+                continue
+
+        detail = refs['related'].errors(data, project_id)
+        if detail:
+            fail('update', index, detail)
+            continue
+        seen.add(task.pk)
+        checked.append((task, data))
+    return checked
+
+
+def _keeps_references(data, task, tagged):
+    # Связи задачи принадлежат старому проекту — их нужно заменить в той же операции
+    return all([
+        task.assigned_to_id is None or 'assigned_to_id' in data,
+        task.priority_id is None or 'priority_id' in data,
+        'tags_ids' in data or task.pk not in tagged,
+    ])
+
+
+class _Changes:
+    """Побочные эффекты пакета: копятся по ходу записи и применяются один раз"""
+
+    def __init__(self):
+        self.board_ids = set()
+        self.counters = defaultdict(lambda: defaultdict(int))
+        self.open_tasks = defaultdict(Counter)  # {project_id: {column_id: изменение}}
+        self.search_task_ids = set()
+        self.moved_out = []  # (task_id, старая доска)
+        self.events = []
+
+    def count(self, project_id, counter):
+        self.counters[project_id][counter] += 1
+
+    def move_open(self, project_id, column_id, delta):
+        self.open_tasks[project_id][column_id] += delta
+
+    def apply(self):
+        build_documents(self.search_task_ids)
+        for task_id, board_id in self.moved_out:
+            record_deletion(Tombstone.TASK, task_id, board_id)
+        bump_board_version(*self.board_ids)
+        for project_id in self.counters.keys() | self.open_tasks.keys():
+            stats.record(project_id, open_tasks=self.open_tasks.get(project_id), **self.counters.get(project_id, {}))
+        send_board_events(self.events)
+
+
+def _append_ranks(column_counts):
+    """Counter колонок -> {column_id: итератор новых рангов в конце колонки}"""
+    last = dict(
+        Task.objects.filter(column_id__in=list(column_counts)).order_by()
+        .values('column_id').annotate(last=Max('rank')).values_list('column_id', 'last')
+    )
+    return {
+        column_id: iter(rank_sequence_after(last.get(column_id), count))
+        for column_id, count in column_counts.items()
+    }
+
+
+def _set_tags(task_tags):
+    """{task_id: [tag_id]} — заменяет теги задач двумя запросами"""
+    if not task_tags:
+        return
+    through = Task.tags.through
+    through.objects.filter(task_id__in=list(task_tags)).delete()
+    through.objects.bulk_create([
+        through(task_id=task_id, tag_id=tag_id)
+        for task_id, tag_ids in task_tags.items() for tag_id in dict.fromkeys(tag_ids)
+    ])
+
+
+def _create(refs, creates, changes):
+    if not creates:
+        return []
+    now = timezone.now()
+    ranks = _append_ranks(Counter(data['column_id'] for _, data in creates))
+
+    tasks = []
+    for _, data in creates:
+        task = Task(
+            column_id=data['column_id'],
+            title=data['title'],
+            description=data.get('description'),
+            due_date=data.get('due_date'),
+            is_completed=data.get('is_completed', False),
+            assigned_to_id=data.get('assigned_to_id'),
+            priority_id=data.get('priority_id'),
+            rank=next(ranks[data['column_id']]),
+        )
+        if task.is_completed:
+            task.completed_at = now
+        if task.assigned_to_id:
+            task.assigned_at = now
+        tasks.append(task)
+    Task.objects.bulk_create(tasks)
+
+    _set_tags({task.pk: data['tags_ids'] for task, (_, data) in zip(tasks, creates) if data.get('tags_ids')})
+
+    for task in tasks:
+        board_id, project_id = refs['columns'][task.column_id]
+        changes.board_ids.add(board_id)
+        changes.count(project_id, 'created')
+        if task.is_completed:
+            changes.count(project_id, 'completed')
+        else:
+            changes.move_open(project_id, task.column_id, 1)
+        changes.search_task_ids.add(task.pk)
+        changes.events.append((board_id, events.TASK_CREATED, task_delta(task)))
+
+    return [{'index': index, 'id': task.pk} for task, (index, _) in zip(tasks, creates)]
+
+
+def _update(refs, updates, changes):
+    if not updates:
+        return []
+    now = timezone.now()
+    moved = [(task, data) for task, data in updates if data.get('column_id', task.column_id) != task.column_id]
+    ranks = _append_ranks(Counter(data['column_id'] for _, data in moved))
+
+    fields = {'updated_at'}
+    tasks = []
+    for task, data in updates:
+        previous = (task.column_id, task.board_id, task.project_id, task.is_completed)
+        for name in ('title', 'description', 'due_date', 'is_completed', 'priority_id'):
+            if name in data:
+                setattr(task, name, data[name])
+                fields.add(name)
+        if 'assigned_to_id' in data:
+            if task.assigned_to_id is None and data['assigned_to_id']:
+                task.assigned_at = now
+                fields.add('assigned_at')
+            task.assigned_to_id = data['assigned_to_id']
+            fields.add('assigned_to_id')
+        # Выполнение учитывается один раз, как в stats.rebuild: по первому completed_at
+        first_completion = task.is_completed and not previous[3] and task.completed_at is None
+        if first_completion:
+            task.completed_at = now
+            fields.add('completed_at')
+        if data.get('column_id', task.column_id) != task.column_id:
+            task.column_id = data['column_id']
+            task.rank = next(ranks[task.column_id])
+            fields |= {'column_id', 'rank'}
+        task.updated_at = now  # bulk_update не обновляет auto_now
+        tasks.append(task)
+
+        board_id, project_id = refs['columns'].get(task.column_id, previous[1:3])
+        changes.board_ids |= {board_id, previous[1]}
+        if first_completion:
+            changes.count(project_id, 'completed')
+        if not previous[3]:
+            changes.move_open(previous[2], previous[0], -1)
+        if not task.is_completed:
+            changes.move_open(project_id, task.column_id, 1)
+        if SEARCH_FIELDS & set(data) or task.column_id != previous[0]:
+            changes.search_task_ids.add(task.pk)
+
+        if task.column_id == previous[0]:
+            changes.events.append((board_id, events.TASK_UPDATED, task_delta(task)))
+            continue
+        if board_id != previous[1]:
+            changes.moved_out.append((task.pk, previous[1]))
+            changes.events.append((previous[1], events.TASK_DELETED, {'id': task.pk}))
+        changes.events.append((board_id, events.TASK_MOVED, dict(task_delta(task), from_column_id=previous[0])))
+
+    Task.objects.bulk_update(tasks, [name.removesuffix('_id') for name in fields])
+    _set_tags({task.pk: data['tags_ids'] for task, data in updates if 'tags_ids' in data})
+    return tasks
+
+
+def _delete(tasks, changes):
+    if not tasks:
+        return
+    for task in tasks:
+        changes.board_ids.add(task.board_id)
+        if not task.is_completed:
+            changes.move_open(task.project_id, task.column_id, -1)
+        changes.events.append((task.board_id, events.TASK_DELETED, {'id': task.pk}))
+    # Надгробия, версии досок и поисковые документы обновят сигналы удаления
+    Task.objects.filter(pk__in=[task.pk for task in tasks]).delete()
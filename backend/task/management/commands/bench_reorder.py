@@ -0,0 +1,96 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from authentication.models import User
+from board.models import Board
+from column.models import Column
+from project.models import Project, ProjectMembers
+from task.models import Task
+from task.ranking import rank_sequence
+from task.views import TaskViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает перестановку карточек в текущей базе (DATABASES["default"]): прежнюю запись '
+        'save() на каждую задачу колонки и update-column-order с одним bulk_update'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--column-sizes', default='10,100,1000', help='Размеры колонок через запятую')
+        parser.add_argument('--repeat', type=int, default=5, help='Перестановок на каждый размер и способ')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['column_sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--column-sizes: целые числа через запятую')
+
+        suffix = time.time_ns()
+        user = User.objects.create(email=f'bench-{suffix}@example.com', username=f'bench-{suffix}', role=None)
+        project = Project.objects.create(name='bench', owner=user)
+        ProjectMembers.objects.create(project=project, user=user)
+        board = Board.objects.create(project=project, name='bench')
+        self.view = TaskViewSet.as_view({'post': 'update_column_order'})
+        self.user = user
+
+        self.stdout.write(f'База: {connection.vendor}, повторов: {options["repeat"]}')
+        self.stdout.write('Задач   Способ            Запросов   Медиана, мс')
+        try:
+            for size in sizes:
+                column, source = self.create_columns(board, size)
+                for title, reorder in (('save() на задачу', self.save_each), ('bulk_update', self.bulk_reorder)):
+                    queries, timings = self.measure(reorder, column, source, options['repeat'])
+                    self.stdout.write(f'{size:>5}   {title:<16}  {queries:>8}   {statistics.median(timings) * 1000:>11.1f}')
+        finally:
+            user.delete()  # каскадом удаляет проект, доску и задачи
+
+    def create_columns(self, board, size):
+        """Колонка из size задач и соседняя колонка, из которой переносится карточка"""
+        column = Column.objects.create(board=board, name=f'bench {size}', order=0)
+        source = Column.objects.create(board=board, name=f'source {size}', order=1)
+        Task.objects.bulk_create(
+            Task(column=column, title=f'task {index}', rank=rank)
+            for index, rank in enumerate(rank_sequence(size))
+        )
+        return column, source
+
+    def measure(self, reorder, column, source, repeat):
+        """Перенос карточки из соседней колонки в начало и последней карточки во вторую позицию"""
+        queries, timings = [], []
+        for _ in range(repeat):
+            moved = Task.objects.create(column=source, title='moved', rank='i')
+            order = list(Task.objects.filter(column=column).order_by('rank', 'id').values_list('pk', flat=True))
+            order = [moved.pk, order[-1], *order[:-1]]
+
+            executed = []
+            started = time.perf_counter()
+            # Счетчик вместо CaptureQueriesContext: тот хранит не больше 9000 запросов
+            with connection.execute_wrapper(lambda execute, *args: executed.append(1) or execute(*args)):
+                reorder(column, order)
+            timings.append(time.perf_counter() - started)
+            queries.append(len(executed))
+            moved.delete()
+        return max(queries), timings
+
+    def save_each(self, column, order):
+        # Прежняя запись: каждая задача колонки сохраняется отдельным UPDATE
+        with transaction.atomic():
+            tasks = Task.objects.in_bulk(order)
+            for task, rank in zip((tasks[pk] for pk in order), rank_sequence(len(order))):
+                task.column = column
+                task.rank = rank
+                task.save(update_fields=['column', 'rank'])
+
+    def bulk_reorder(self, column, order):
+        request = APIRequestFactory().post(
+            f'/api/v1/task/update-column-order/{column.pk}/', {'task_order': order}, format='json'
+        )
+        force_authenticate(request, self.user)
+        response = self.view(request, column_id=column.pk)
+        if response.status_code != 200:
+            raise CommandError(f'update-column-order: {response.status_code} {response.data}')
@@ -0,0 +1,105 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from authentication.models import User
+from board.cache import get_cache
+from board.models import Board
+from board.views import BoardViewSet
+from column.models import Column
+from comment.models import Comment
+from project.models import Project, ProjectMembers
+from tag.models import Tag
+from task.models import Subtask, Task
+from task.ranking import rank_sequence
+from task.views import TaskViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Размер ответа, число запросов и время списка задач и доски на проекте из --tasks задач '
+        'в текущей базе (DATABASES["default"]): ссылка на колонку против ?expand=column'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=5000, help='Задач в проекте')
+        parser.add_argument('--columns', type=int, default=5, help='Колонок на доске')
+        parser.add_argument('--page-size', type=int, default=50, help='?page_size= списка задач')
+        parser.add_argument('--repeat', type=int, default=3, help='Повторов каждого запроса')
+
+    def handle(self, *args, **options):
+        self.factory = APIRequestFactory()
+        # build_absolute_uri проверяет Host по ALLOWED_HOSTS
+        self.host = next((host for host in settings.ALLOWED_HOSTS if host not in ('*',) and not host.startswith('.')), 'localhost')
+        self.user, board = self.create_project(options['tasks'], options['columns'])
+
+        task_list = TaskViewSet.as_view({'get': 'list'})
+        board_detail = BoardViewSet.as_view({'get': 'retrieve'})
+        page = f'/api/v1/task/?page_size={options["page_size"]}'
+        cases = [
+            ('/task/, ссылка на колонку', lambda: task_list(self.get(page))),
+            ('/task/?expand=column', lambda: task_list(self.get(f'{page}&expand=column'))),
+            ('/boards/{id}/, без кэша', lambda: self.cold(board_detail, board)),
+        ]
+
+        self.stdout.write(f'База: {connection.vendor}, задач: {options["tasks"]}, колонок: {options["columns"]}')
+        self.stdout.write('Запрос                        Запросов      Ответ, КБ   Медиана, мс')
+        try:
+            for title, call in cases:
+                queries, size, timings = self.measure(call, options['repeat'])
+                self.stdout.write(
+                    f'{title:<28}  {queries:>8}  {size / 1024:>13.1f}   {statistics.median(timings) * 1000:>11.1f}'
+                )
+        finally:
+            self.user.delete()  # каскадом удаляет проект, доску и задачи
+
+    def create_project(self, count, columns):
+        suffix = time.time_ns()
+        user = User.objects.create(email=f'bench-{suffix}@example.com', username=f'bench-{suffix}', role=None)
+        project = Project.objects.create(name='bench', owner=user)
+        ProjectMembers.objects.create(project=project, user=user)
+        tags = Tag.objects.bulk_create(Tag(project=project, name=f'bench {index}') for index in range(3))
+        board = Board.objects.create(project=project, name='bench')
+        columns = Column.objects.bulk_create(
+            Column(board=board, name=f'bench {index}', order=index) for index in range(columns)
+        )
+
+        # Задачи поровну по колонкам, у каждой тег, подзадача и комментарий
+        per_column = -(-count // len(columns))
+        ranks = rank_sequence(per_column)
+        tasks = Task.objects.bulk_create(
+            Task(column=columns[index % len(columns)], title=f'task {index}', assigned_to=user,
+                 rank=ranks[index // len(columns)])
+            for index in range(count)
+        )
+        Task.tags.through.objects.bulk_create(
+            Task.tags.through(task_id=task.pk, tag_id=tags[index % len(tags)].pk) for index, task in enumerate(tasks)
+        )
+        Subtask.objects.bulk_create(Subtask(task=task, title='bench', rank='i') for task in tasks)
+        Comment.objects.bulk_create(Comment(task=task, author=user, content='bench') for task in tasks)
+        return user, board
+
+    def get(self, path):
+        request = self.factory.get(path, HTTP_HOST=self.host)
+        force_authenticate(request, self.user)
+        return request
+
+    def cold(self, view, board):
+        get_cache().clear()
+        return view(self.get(f'/api/v1/boards/{board.pk}/'), pk=board.pk)
+
+    def measure(self, call, repeat):
+        queries, timings = [], []
+        for _ in range(repeat):
+            executed = []
+            started = time.perf_counter()
+            with connection.execute_wrapper(lambda execute, *args: executed.append(1) or execute(*args)):
+                response = call()
+                response.render()
+            timings.append(time.perf_counter() - started)
+            queries.append(len(executed))
+        return max(queries), len(response.content), timings
@@ -0,0 +1,115 @@
+import random
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from django.utils import timezone
+
+from authentication.models import User
+from board.models import Board
+from column.models import Column
+from project.models import Project
+from task.models import Task
+from task.ranking import rank_sequence
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест конкурентной записи в текущую базу (DATABASES["default"]): '
+        'правка задач, таймеры и перестановка карточек из нескольких потоков'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--ops', type=int, default=200, help='Операций на поток')
+        parser.add_argument('--tasks', type=int, default=100, help='Задач на тестовой доске')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        project, column, task_ids = self.create_board(options['tasks'])
+
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            local_latencies, local_errors = [], []
+            try:
+                for _ in range(options['ops']):
+                    operation = rng.choice([self.edit_task, self.toggle_timer, self.reorder])
+                    started = time.perf_counter()
+                    try:
+                        operation(rng, column, task_ids)
+                    except OperationalError as error:
+                        local_errors.append(str(error))
+                        continue
+                    local_latencies.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+            with lock:
+                latencies.extend(local_latencies)
+                errors.extend(local_errors)
+
+        threads = [threading.Thread(target=worker, args=(options['seed'] + index,))
+                   for index in range(options['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        project.owner.delete()  # каскадом удаляет проект, доску и задачи
+
+        self.report(connection.vendor, options, elapsed, latencies, errors)
+
+    def create_board(self, count):
+        suffix = time.time_ns()
+        owner = User.objects.create(email=f'bench-{suffix}@example.com', username=f'bench-{suffix}', role=None)
+        project = Project.objects.create(name='bench', owner=owner)
+        board = Board.objects.create(project=project, name='bench')
+        column = Column.objects.create(board=board, name='bench', order=0)
+        tasks = Task.objects.bulk_create(
+            Task(column=column, title=f'task {index}', rank=rank)
+            for index, rank in enumerate(rank_sequence(count))
+        )
+        return project, column, [task.pk for task in tasks]
+
+    def edit_task(self, rng, column, task_ids):
+        task = Task.objects.get(pk=rng.choice(task_ids))
+        task.title = f'task {rng.randrange(10 ** 6)}'
+        task.save()
+
+    def toggle_timer(self, rng, column, task_ids):
+        with transaction.atomic():
+            task = Task.objects.select_for_update().get(pk=rng.choice(task_ids))
+            task.is_timer_running = not task.is_timer_running
+            task.timer_started_at = timezone.now() if task.is_timer_running else None
+            task.save(update_fields=['is_timer_running', 'timer_started_at', 'updated_at'])
+
+    def reorder(self, rng, column, task_ids):
+        moved = Task.objects.filter(pk__in=rng.sample(task_ids, min(5, len(task_ids)))).only('id', 'rank')
+        with transaction.atomic():
+            moved = list(moved)
+            for task in moved:
+                task.rank = f'{task.rank}{rng.choice("123456789")}'
+                task.updated_at = timezone.now()
+            Task.objects.bulk_update(moved, ['rank', 'updated_at'])
+
+    def report(self, vendor, options, elapsed, latencies, errors):
+        total = options['threads'] * options['ops']
+        self.stdout.write(f'База: {vendor}, потоков: {options["threads"]}, операций: {total}')
+        self.stdout.write(f'Время: {elapsed:.2f} с, пропускная способность: {len(latencies) / elapsed:.1f} оп/с')
+        if latencies:
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            self.stdout.write(
+                f'Задержка: медиана {statistics.median(latencies) * 1000:.1f} мс, p95 {p95 * 1000:.1f} мс'
+            )
+        if errors:
+            self.stdout.write(self.style.WARNING(f'Ошибок: {len(errors)} (например: {errors[0]})'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Ошибок нет'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from task.query_plans import explain_hot_queries
+
+
+class Command(BaseCommand):
+    help = 'Проверяет через EXPLAIN, что основные запросы используют индексы (то же, что тест task.tests)'
+
+    def handle(self, *args, **options):
+        failed = []
+        for title, plan, ok in explain_hot_queries():
+            if ok:
+                self.stdout.write(f'OK    {title}')
+            else:
+                failed.append(title)
+                self.stdout.write(self.style.ERROR(f'FAIL  {title}\n{plan}'))
+
+        if failed:
+            raise CommandError(f'Без индекса выполняются: {", ".join(failed)}')
+        self.stdout.write(self.style.SUCCESS('Все запросы используют индексы'))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.functions import Length
+
+from board.cache import bump_board_version
+from task.models import Task, Subtask
+from task.ranking import MAX_RANK_LENGTH, rebalance
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает ранги задач и подзадач там, где они стали слишком длинными или совпадают'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-length', type=int, default=MAX_RANK_LENGTH // 2,
+            help='Пересчитывать группы, где длина ранга превышает это значение'
+        )
+
+    def handle(self, *args, **options):
+        columns = self.groups_to_rebalance(Task.objects.all(), 'column', options['max_length'])
+        for column_id in columns:
+            with transaction.atomic():
+                rebalance(Task.objects.filter(column_id=column_id))
+
+        tasks = self.groups_to_rebalance(Subtask.objects.all(), 'task', options['max_length'])
+        for task_id in tasks:
+            with transaction.atomic():
+                rebalance(Subtask.objects.filter(task_id=task_id))
+
+        # bulk_update не отправляет сигналы — снимки досок сбрасываются здесь
+        bump_board_version(
+            *Task.objects.filter(column_id__in=columns).values_list('column__board_id', flat=True).distinct(),
+            *Task.objects.filter(pk__in=tasks).values_list('column__board_id', flat=True).distinct(),
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитаны ранги: колонок — {len(columns)}, задач с подзадачами — {len(tasks)}'
+        ))
+
+    def groups_to_rebalance(self, queryset, group_field, max_length):
+        groups = queryset.order_by().values(group_field).annotate(
+            longest=Max(Length('rank')),
+            total=Count('pk'),
+            distinct=Count('rank', distinct=True),
+        )
+        return [
+            group[group_field] for group in groups
+            if group['longest'] > max_length or group['distinct'] < group['total']
+        ]
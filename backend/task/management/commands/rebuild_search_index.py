@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from task.models import Task, TaskSearchDocument
+from task.search import build_documents
+
+BATCH_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = 'Заново строит поисковые документы задач (например, после массового импорта)'
+
+    def handle(self, *args, **options):
+        TaskSearchDocument.objects.filter(task__column__isnull=True).delete()
+
+        task_ids = Task.objects.filter(column__isnull=False).values_list('pk', flat=True)
+        batch = []
+        total = 0
+        for task_id in task_ids.iterator(chunk_size=BATCH_SIZE):
+            batch.append(task_id)
+            if len(batch) == BATCH_SIZE:
+                build_documents(batch)
+                total += len(batch)
+                batch = []
+        build_documents(batch)
+        total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Обновлено документов: {total}'))
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:22
+
+from itertools import groupby
+
+from django.db import migrations, models
+
+# Копия task.ranking.rank_sequence на момент миграции: код приложения может измениться
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+
+def rank_sequence(count):
+    """count равномерно распределенных возрастающих рангов"""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    step = BASE ** width // (count + 1)
+
+    ranks = []
+    for position in range(1, count + 1):
+        value = position * step
+        digits = []
+        for _ in range(width):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+        ranks.append(''.join(reversed(digits)).rstrip('0'))
+    return ranks
+
+
+def _assign_ranks(queryset, group_field, batch_size=1000):
+    # Ранги выдаются внутри каждой группы в порядке старых номеров
+    objects = list(queryset.order_by(group_field, 'order', 'id').only('id', group_field, 'order'))
+    for _, group in groupby(objects, key=lambda obj: getattr(obj, f'{group_field}_id')):
+        group = list(group)
+        for obj, rank in zip(group, rank_sequence(len(group))):
+            obj.rank = rank
+    queryset.model.objects.bulk_update(objects, ['rank'], batch_size=batch_size)
+
+
+def _assign_orders(queryset, group_field, batch_size=1000):
+    objects = list(queryset.order_by(group_field, 'rank', 'id').only('id', group_field, 'rank'))
+    for _, group in groupby(objects, key=lambda obj: getattr(obj, f'{group_field}_id')):
+        for order, obj in enumerate(group):
+            obj.order = order
+    queryset.model.objects.bulk_update(objects, ['order'], batch_size=batch_size)
+
+
+def orders_to_ranks(apps, schema_editor):
+    _assign_ranks(apps.get_model('task', 'Task').objects.all(), 'column')
+    _assign_ranks(apps.get_model('task', 'Subtask').objects.all(), 'task')
+
+
+def ranks_to_orders(apps, schema_editor):
+    _assign_orders(apps.get_model('task', 'Task').objects.all(), 'column')
+    _assign_orders(apps.get_model('task', 'Subtask').objects.all(), 'task')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0008_remove_task_image_remove_task_role'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subtask',
+            name='rank',
+            field=models.CharField(default='', max_length=255, verbose_name='Ранг в задаче'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(default='', max_length=255, verbose_name='Ранг в колонке'),
+        ),
+        migrations.RunPython(orders_to_ranks, ranks_to_orders),
+        migrations.AlterModelOptions(
+            name='subtask',
+            options={'ordering': ['rank', 'id']},
+        ),
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['rank', 'id'], 'verbose_name': 'Задача', 'verbose_name_plural': 'Задачи'},
+        ),
+        migrations.RemoveField(
+            model_name='subtask',
+            name='order',
+        ),
+        migrations.RemoveField(
+            model_name='task',
+            name='order',
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('column', '0005_column_updated_at'),
+        ('priority', '0003_remove_priority_description'),
+        ('tag', '0003_remove_tag_description'),
+        ('task', '0010_subtask_updated_at_alter_task_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['column', 'rank', 'id'], name='task_column_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['assigned_to', 'due_date'], name='task_assignee_open_due_idx'),
+        ),
+    ]
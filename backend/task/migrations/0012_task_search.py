@@ -0,0 +1,122 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+FTS_TABLE = 'task_search_fts'
+CONTENT_VIEW = 'task_search_content'
+DOCUMENT_TABLE = 'task_tasksearchdocument'
+VECTOR_COLUMN = 'search_vector'
+GIN_INDEX = 'task_search_vector_gin'
+
+SQLITE_CREATE = [
+    # Проект — отдельная колонка FTS с токеном вида p42, чтобы фильтр по
+    # проектам пользователя выполнялся самим индексом
+    f"""CREATE VIEW {CONTENT_VIEW} AS
+        SELECT task_id, 'p' || project_id AS project, title, body FROM {DOCUMENT_TABLE}""",
+    # Внешнее содержимое: FTS5 хранит только индекс, текст берется из представления
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        project, title, body, content='{CONTENT_VIEW}', content_rowid='task_id',
+        tokenize='unicode61 remove_diacritics 2', prefix='3 4'
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, project, title, body)
+        VALUES (new.task_id, 'p' || new.project_id, new.title, new.body);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, project, title, body)
+        VALUES ('delete', old.task_id, 'p' || old.project_id, old.title, old.body);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, project, title, body)
+        VALUES ('delete', old.task_id, 'p' || old.project_id, old.title, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, project, title, body)
+        VALUES (new.task_id, 'p' || new.project_id, new.title, new.body);
+    END""",
+]
+SQLITE_DROP = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+    f'DROP VIEW IF EXISTS {CONTENT_VIEW}',
+]
+POSTGRES_CREATE = [
+    # Вектор хранится, а не вычисляется при ранжировании и перепроверке строк
+    f"""ALTER TABLE {DOCUMENT_TABLE} ADD COLUMN {VECTOR_COLUMN} tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(body, '')), 'B')
+    ) STORED""",
+    f'CREATE INDEX {GIN_INDEX} ON {DOCUMENT_TABLE} USING gin ({VECTOR_COLUMN})',
+]
+POSTGRES_DROP = [
+    f'DROP INDEX IF EXISTS {GIN_INDEX}',
+    f'ALTER TABLE {DOCUMENT_TABLE} DROP COLUMN IF EXISTS {VECTOR_COLUMN}',
+]
+
+
+def _execute(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    _execute(schema_editor, {'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE})
+
+
+def drop_search_index(apps, schema_editor):
+    _execute(schema_editor, {'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP})
+
+
+def fill_documents(apps, schema_editor, batch_size=1000):
+    Task = apps.get_model('task', 'Task')
+    Subtask = apps.get_model('task', 'Subtask')
+    Comment = apps.get_model('comment', 'Comment')
+    Document = apps.get_model('task', 'TaskSearchDocument')
+
+    tasks = Task.objects.filter(column__isnull=False).order_by('pk').values_list(
+        'pk', 'title', 'description', 'column__board__project_id'
+    )
+    batch = []
+    for task in tasks.iterator(chunk_size=batch_size):
+        batch.append(task)
+        if len(batch) == batch_size:
+            _fill_batch(batch, Subtask, Comment, Document)
+            batch = []
+    if batch:
+        _fill_batch(batch, Subtask, Comment, Document)
+
+
+def _fill_batch(tasks, Subtask, Comment, Document):
+    parts = {pk: [description or ''] for pk, _, description, _ in tasks}
+    for model, field in ((Subtask, 'title'), (Comment, 'content')):
+        for task_id, text in model.objects.filter(task_id__in=parts).values_list('task_id', field):
+            parts[task_id].append(text)
+
+    Document.objects.bulk_create([
+        Document(task_id=pk, project_id=project_id, title=title, body='\n'.join(filter(None, parts[pk])))
+        for pk, title, _, project_id in tasks
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0004_alter_project_key'),
+        ('task', '0011_task_task_column_rank_idx_and_more'),
+        ('comment', '0005_comment_comment_task_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskSearchDocument',
+            fields=[
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='task.task')),
+                ('title', models.CharField(max_length=100)),
+                ('body', models.TextField(blank=True, default='')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='project.project')),
+            ],
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(fill_documents, migrations.RunPython.noop),
+    ]
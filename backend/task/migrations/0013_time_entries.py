@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:45
+
+import django.db.models.deletion
+from django.conf import settings
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+
+
+def time_to_entries(apps, schema_editor):
+    # Накопленное время переносится в tracked_seconds и одну итоговую запись
+    # на задачу, идущие таймеры — в открытые записи
+    Task = apps.get_model('task', 'Task')
+    TimeEntry = apps.get_model('task', 'TimeEntry')
+
+    tasks = Task.objects.filter(models.Q(time__isnull=False) | models.Q(is_timer_running=True)).values(
+        'pk', 'time', 'assigned_to_id', 'started_at', 'created_at', 'timer_started_at',
+        'is_timer_running', 'column__board__project_id',
+    )
+    entries = []
+    for task in tasks.iterator():
+        seconds = 0
+        if task['time']:
+            seconds = task['time'].hour * 3600 + task['time'].minute * 60 + task['time'].second
+            Task.objects.filter(pk=task['pk']).update(tracked_seconds=seconds)
+
+        project_id = task['column__board__project_id']
+        if project_id is None:
+            continue
+        if seconds:
+            started_at = task['started_at'] or task['created_at']
+            entries.append(TimeEntry(
+                task_id=task['pk'], user_id=task['assigned_to_id'], project_id=project_id,
+                started_at=started_at, ended_at=started_at + timedelta(seconds=seconds), duration=seconds,
+            ))
+        if task['is_timer_running'] and task['timer_started_at']:
+            entries.append(TimeEntry(
+                task_id=task['pk'], user_id=task['assigned_to_id'], project_id=project_id,
+                started_at=task['timer_started_at'],
+            ))
+    TimeEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+def entries_to_time(apps, schema_editor):
+    Task = apps.get_model('task', 'Task')
+    for pk, seconds in Task.objects.filter(tracked_seconds__gt=0).values_list('pk', 'tracked_seconds').iterator():
+        # TimeField не вмещает больше суток
+        seconds = min(seconds, 24 * 3600 - 1)
+        Task.objects.filter(pk=pk).update(time=(datetime.min + timedelta(seconds=seconds)).time())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0004_alter_project_key'),
+        ('task', '0012_task_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='tracked_seconds',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='Учтено секунд'),
+        ),
+        migrations.CreateModel(
+            name='TimeEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(verbose_name='Начало')),
+                ('ended_at', models.DateTimeField(blank=True, null=True, verbose_name='Конец')),
+                ('duration', models.PositiveIntegerField(blank=True, null=True, verbose_name='Длительность, с')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_entries', to='project.project', verbose_name='Проект')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_entries', to='task.task', verbose_name='Задача')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='time_entries', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Запись времени',
+                'verbose_name_plural': 'Записи времени',
+                'indexes': [models.Index(fields=['user', 'started_at'], name='timeentry_user_started_idx'), models.Index(fields=['project', 'started_at'], name='timeentry_project_started_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('ended_at__isnull', True)), fields=('task',), name='timeentry_one_running_per_task')],
+            },
+        ),
+        migrations.RunPython(time_to_entries, entries_to_time),
+        migrations.RemoveField(
+            model_name='task',
+            name='time',
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('column', '0005_column_updated_at'),
+        ('priority', '0003_remove_priority_description'),
+        ('tag', '0003_remove_tag_description'),
+        ('task', '0013_time_entries'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['column', 'is_completed', 'created_at'], name='task_column_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', True)), fields=['column', 'completed_at', 'created_at', 'started_at', 'is_completed'], name='task_column_completed_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('column', '0005_column_updated_at'),
+        ('priority', '0003_remove_priority_description'),
+        ('tag', '0003_remove_tag_description'),
+        ('task', '0014_analytics_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_assignee_open_due_idx',
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'is_completed', 'due_date', 'priority', 'column', 'id'], name='task_assignee_due_idx'),
+        ),
+    ]
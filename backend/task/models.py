@@ -15,15 +15,16 @@ class Task(models.Model):
     priority = models.ForeignKey(Priority, verbose_name='Приоритет', on_delete=models.SET_NULL, null=True, related_name='tasks')
     due_date = models.DateField(verbose_name='Срок сдачи', null=True, blank=True)
     created_at = models.DateTimeField(verbose_name='Создан', auto_now_add=True)
-    updated_at = models.DateTimeField(verbose_name='Изменён', auto_now=True)
+    updated_at = models.DateTimeField(verbose_name='Изменён', auto_now=True, db_index=True)
     tags = models.ManyToManyField(Tag, verbose_name='Теги', related_name='tasks')
     assigned_at = models.DateTimeField(verbose_name='Назначена', null=True, blank=True)
     started_at = models.DateTimeField(verbose_name='Приступил к работе', null=True, blank=True)
     submitted_at = models.DateTimeField(verbose_name='Отправлена на проверку', null=True, blank=True)
     completed_at = models.DateTimeField(verbose_name='Выполнена', null=True, blank=True)
-    time = models.TimeField(verbose_name='Время', null=True, blank=True)
+    # Сумма закрытых записей TimeEntry, обновляется через F() при остановке таймера
+    tracked_seconds = models.PositiveBigIntegerField(verbose_name='Учтено секунд', default=0)
     is_completed = models.BooleanField(verbose_name='Выполнена', default=False)
-    order = models.IntegerField(verbose_name='Порядковый номер', default=0)
+    rank = models.CharField(verbose_name='Ранг в колонке', max_length=255, default='')
     timer_started_at = models.DateTimeField(null=True, blank=True)
     is_timer_running = models.BooleanField(default=False)
 
@@ -32,27 +33,77 @@ class Task(models.Model):
         return self.title
     
     def get_total_time(self):
-        if not self.time:
-            return timedelta(0)
-        return timedelta(
-            hours=self.time.hour,
-            minutes=self.time.minute,
-            seconds=self.time.second
-        )
-    
-    def add_time(self, duration: timedelta):
-        total = self.get_total_time() + duration
-        self.time = (datetime.min + total).time()
-        self.save()
+        return timedelta(seconds=self.tracked_seconds)
 
     class Meta:
         verbose_name = 'Задача'
         verbose_name_plural = 'Задачи'
-        ordering = ['order']
+        ordering = ['rank', 'id']
+        indexes = [
+            # Задачи колонки в порядке карточек
+            models.Index(fields=['column', 'rank', 'id'], name='task_column_rank_idx'),
+            # «Мои задачи» (/task/mine/): поиск по исполнителю, а фильтры, срок и id
+            # приоритета берутся из индекса без строк задач. Порядок индекс не дает:
+            # сортировка по COALESCE срока и приоритета идет во временном B-дереве
+            # по задачам исполнителя
+            models.Index(
+                fields=['assigned_to', 'is_completed', 'due_date', 'priority', 'column', 'id'],
+                name='task_assignee_due_idx',
+            ),
+            # Аналитика проекта (project/analytics.py) читает только эти индексы:
+            # WIP и накопленный объем задач по колонкам
+            models.Index(fields=['column', 'is_completed', 'created_at'], name='task_column_created_idx'),
+            # выполненные задачи по дате выполнения вместе с моментами для времени цикла;
+            # is_completed в конце: SQLite читает только покрывающий индекс, если в нем
+            # есть все колонки запроса, включая колонку условия
+            models.Index(
+                fields=['column', 'completed_at', 'created_at', 'started_at', 'is_completed'],
+                condition=models.Q(is_completed=True),
+                name='task_column_completed_idx',
+            ),
+        ]
         
 
 class Subtask(models.Model):
     title = models.CharField(verbose_name='Название', max_length=100)
     task = models.ForeignKey('Task', verbose_name='Задача', on_delete=models.CASCADE, related_name='subtasks')
     is_completed = models.BooleanField(verbose_name='Выполнена', default=False)
-    order = models.IntegerField(verbose_name='Порядковый номер', blank=True, null=True)
\ No newline at end of file
+    rank = models.CharField(verbose_name='Ранг в задаче', max_length=255, default='')
+    updated_at = models.DateTimeField(verbose_name='Изменена', auto_now=True, db_index=True)
+
+    class Meta:
+        ordering = ['rank', 'id']
+
+class TimeEntry(models.Model):
+    """Интервал работы над задачей; открытая запись (ended_at пуст) — идущий таймер"""
+    task = models.ForeignKey(Task, verbose_name='Задача', on_delete=models.CASCADE, related_name='time_entries')
+    user = models.ForeignKey(User, verbose_name='Пользователь', on_delete=models.SET_NULL, null=True, related_name='time_entries')
+    # Проект копируется из задачи, чтобы отчеты по проекту не соединяли четыре таблицы
+    project = models.ForeignKey('project.Project', verbose_name='Проект', on_delete=models.CASCADE, related_name='time_entries')
+    started_at = models.DateTimeField(verbose_name='Начало')
+    ended_at = models.DateTimeField(verbose_name='Конец', null=True, blank=True)
+    duration = models.PositiveIntegerField(verbose_name='Длительность, с', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Запись времени'
+        verbose_name_plural = 'Записи времени'
+        indexes = [
+            models.Index(fields=['user', 'started_at'], name='timeentry_user_started_idx'),
+            models.Index(fields=['project', 'started_at'], name='timeentry_project_started_idx'),
+        ]
+        constraints = [
+            # У задачи не больше одного идущего таймера
+            models.UniqueConstraint(fields=['task'], condition=models.Q(ended_at__isnull=True), name='timeentry_one_running_per_task'),
+        ]
+
+
+class TaskSearchDocument(models.Model):
+    """
+    Текст задачи для полнотекстового поиска (task/search.py): название,
+    описание, подзадачи и комментарии. Сам индекс зависит от СУБД — FTS5
+    в SQLite, GIN по tsvector в PostgreSQL — и создается миграцией.
+    """
+    task = models.OneToOneField(Task, on_delete=models.CASCADE, primary_key=True, related_name='search_document')
+    project = models.ForeignKey('project.Project', on_delete=models.CASCADE, related_name='+')
+    title = models.CharField(max_length=100)
+    body = models.TextField(blank=True, default='')
@@ -0,0 +1,35 @@
+from datetime import date
+
+from django.db.models import DateField, Prefetch, Value
+from django.db.models.functions import Coalesce
+
+from comment.models import Comment
+from .models import Subtask
+
+
+def with_task_details(queryset):
+    """
+    Подгружает всё, что выводит BaseTaskSerializer: исполнителя, приоритет,
+    отчет, теги, подзадачи и комментарии с авторами.
+    """
+    return queryset.select_related(
+        'assigned_to__role',
+        'priority',
+        'report__author__role',
+    ).prefetch_related(
+        'tags',
+        Prefetch('subtasks', queryset=Subtask.objects.all()),
+        Prefetch('comments', queryset=Comment.objects.select_related('author__role').order_by('created_at', 'id')),
+    )
+
+
+def with_due_order(queryset):
+    """
+    Ключи сортировки «Моих задач» без NULL, чтобы по ним работала курсорная
+    пагинация: due — срок (задачи без срока в конце), urgency — порядок
+    приоритета (чем больше, тем важнее; без приоритета — ниже всех).
+    """
+    return queryset.annotate(
+        due=Coalesce('due_date', Value(date.max), output_field=DateField()),
+        urgency=Coalesce('priority__order', Value(-1)),
+    )
@@ -0,0 +1,54 @@
+"""
+Планы основных запросов: каждый должен идти по индексу, а не полным
+просмотром таблицы. Проверяются тестом task/tests.py и командой
+check_query_plans.
+"""
+from django.db import connection, transaction
+
+from authentication.models import FriendRequest
+from core.pagination import MyTaskPagination
+from comment.models import Comment
+from project.models import Project
+from .models import Task
+from .queries import with_due_order
+
+
+def hot_queries():
+    """(название, queryset, индекс, который должен использовать план)"""
+    return [
+        ('Задачи колонки по рангу',
+         Task.objects.filter(column_id=1).order_by('rank', 'id'), 'task_column_rank_idx'),
+        ('Мои задачи по сроку и приоритету',
+         with_due_order(Task.objects.filter(assigned_to_id=1).only('id')).order_by(*MyTaskPagination.ordering),
+         'task_assignee_due_idx'),
+        ('Комментарии задачи по времени',
+         Comment.objects.filter(task_id=1).order_by('created_at', 'id'), 'comment_task_created_idx'),
+        ('Входящие запросы в друзья',
+         FriendRequest.objects.filter(receiver_id=1, status=FriendRequest.PENDING).order_by('-created_at'),
+         'friendrequest_inbox_idx'),
+        # Имя уникального индекса зависит от СУБД, достаточно любого индекса
+        ('Проект по ключу', Project.objects.filter(key='ABC123'), None),
+    ]
+
+
+def explain_hot_queries():
+    """[(название, план, идет ли по индексу)] для hot_queries()"""
+    results = []
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # На маленьких таблицах планировщик предпочтет Seq Scan
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+        for title, queryset, index in hot_queries():
+            plan = queryset.explain()
+            results.append((title, plan, uses_index(plan, index)))
+    return results
+
+
+def uses_index(plan, index):
+    if index is not None:
+        return index in plan
+    if connection.vendor == 'sqlite':
+        return 'USING INDEX' in plan or 'USING COVERING INDEX' in plan
+    return 'Index' in plan
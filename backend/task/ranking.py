@@ -0,0 +1,169 @@
+"""
+Дробные (лексикографические) ранги для порядка задач и подзадач.
+
+Ранг — строка из цифр base36, сравниваемая как строка. Между любыми двумя
+рангами всегда есть третий, поэтому перенос карточки меняет одну строку,
+а не перенумеровывает всю колонку. Ранги не заканчиваются на '0', иначе
+перед ними не нашлось бы места.
+
+В начало и конец списка ранг ставится соседним числом той же длины, поэтому
+добавления в конец не удлиняют ранги, пока числа этой длины не кончатся.
+Вставки между соседями удлиняют ранги; слишком длинные пересчитывает
+команда rebalance_ranks вне запросов.
+"""
+from bisect import bisect_left
+
+from django.utils import timezone
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+# Группы с рангами длиннее пересчитывает команда rebalance_ranks
+MAX_RANK_LENGTH = 32
+
+
+def rank_between(before=None, after=None):
+    """Ранг строго между before и after; None означает начало или конец списка"""
+    before = before or ''
+    if after is not None and after <= before:
+        raise ValueError(f'Ранг {after!r} должен быть больше {before!r}')
+    if before and after is None:
+        return rank_after(before)
+    if not before and after:
+        return rank_before(after)
+    return _midpoint(before, after)
+
+
+def rank_after(before):
+    """Следующий ранг той же длины; когда они кончились — вдвое длиннее"""
+    width = len(before)
+    value = int(before, BASE) + 1
+    if value % BASE == 0:
+        value += 1  # ранг не может кончаться на '0'
+    if value < BASE ** width:
+        return _format(value, width)
+    return before + '0' * (width - 1) + '1'
+
+
+def rank_before(after):
+    """Предыдущий ранг той же длины; когда они кончились — вдвое длиннее"""
+    width = len(after)
+    value = int(after, BASE) - 1
+    if value % BASE == 0:
+        value -= 1
+    if value > 0:
+        return _format(value, width)
+    return '0' * width + DIGITS[-1] * width
+
+
+def _format(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits))
+
+
+def _midpoint(before, after):
+    if after is not None:
+        # Общий префикс переносится в результат как есть
+        prefix = 0
+        while prefix < len(after) and (before[prefix] if prefix < len(before) else '0') == after[prefix]:
+            prefix += 1
+        if prefix:
+            return after[:prefix] + _midpoint(before[prefix:], after[prefix:])
+
+    low = DIGITS.index(before[0]) if before else 0
+    high = DIGITS.index(after[0]) if after is not None else BASE
+
+    if high - low > 1:
+        return DIGITS[(low + high) // 2]
+
+    # Соседние цифры: берем короткий префикс after или углубляемся после before
+    if after is not None and len(after) > 1:
+        return after[0]
+    return DIGITS[low] + _midpoint(before[1:], None)
+
+
+def rank_sequence(count):
+    """count равномерно распределенных возрастающих рангов"""
+    width = 1
+    while BASE ** width <= count:
+        width += 1
+    step = BASE ** width // (count + 1)
+
+    return [_format(position * step, width).rstrip('0') for position in range(1, count + 1)]
+
+
+def rank_sequence_after(before, count):
+    """count возрастающих рангов после before — для пачки задач в конец списка"""
+    if not before:
+        return rank_sequence(count)
+    ranks = []
+    for _ in range(count):
+        before = rank_after(before)
+        ranks.append(before)
+    return ranks
+
+
+def rebalance(queryset):
+    """Заново раздает равномерные ранги объектам queryset в текущем порядке"""
+    objects = list(queryset.order_by('rank', 'pk').only('pk', 'rank'))
+    now = timezone.now()
+    for obj, rank in zip(objects, rank_sequence(len(objects))):
+        obj.rank = rank
+        obj.updated_at = now  # иначе новые ранги не попадут в дельту доски
+    queryset.model.objects.bulk_update(objects, ['rank', 'updated_at'])
+    return objects
+
+
+def rerank(items, current_rank):
+    """
+    Ранги для нового порядка items с минимальным числом изменений.
+    current_rank(item) — текущий ранг элемента или None, если он пришел из
+    другого списка. Элементы из наибольшей возрастающей подпоследовательности
+    сохраняют ранги, остальные получают ранги между соседями.
+    Возвращает [(item, new_rank)] только для изменившихся элементов.
+    """
+    ranks = [current_rank(item) or None for item in items]
+    keep = _longest_increasing(ranks)
+
+    # following[i] — ранг ближайшего сохраняемого элемента после i
+    following = [None] * len(items)
+    for index in range(len(items) - 2, -1, -1):
+        following[index] = ranks[index + 1] if index + 1 in keep else following[index + 1]
+
+    changed = []
+    previous = None
+    for index, item in enumerate(items):
+        if index in keep:
+            previous = ranks[index]
+            continue
+        previous = rank_between(previous, following[index])
+        changed.append((item, previous))
+    return changed
+
+
+def _longest_increasing(ranks):
+    """Индексы наибольшей строго возрастающей подпоследовательности (None пропускаются)"""
+    tails = []       # tails[k] — индекс последнего элемента цепочки длины k + 1
+    tail_ranks = []
+    parents = {}
+    for index, rank in enumerate(ranks):
+        if rank is None:
+            continue
+        length = bisect_left(tail_ranks, rank)
+        parents[index] = tails[length - 1] if length else None
+        if length == len(tails):
+            tails.append(index)
+            tail_ranks.append(rank)
+        else:
+            tails[length] = index
+            tail_ranks[length] = rank
+
+    keep = set()
+    index = tails[-1] if tails else None
+    while index is not None:
+        keep.add(index)
+        index = parents[index]
+    return keep
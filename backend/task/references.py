@@ -0,0 +1,63 @@
+"""
+Проверка связей задач — исполнителя, приоритета и тегов — пачкой.
+
+Все id, на которые ссылается запрос (одна задача или целый пакет
+task/bulk.py), загружаются одним запросом на модель и только в пределах
+проектов задач: исполнитель — участник проекта, приоритет и теги — этого
+проекта. У задачи без колонки проекта нет, для нее проверяется только
+существование объектов.
+"""
+from authentication.models import User
+from priority.models import Priority
+from project.models import ProjectMembers
+from tag.models import Tag
+
+
+class TaskReferences:
+    """Связи задач items в проектах project_ids (None — задача без проекта)"""
+
+    def __init__(self, items, project_ids):
+        project_ids = set(project_ids)
+        scoped = project_ids - {None}
+        user_ids = {item['assigned_to_id'] for item in items if item.get('assigned_to_id')}
+        priority_ids = {item['priority_id'] for item in items if item.get('priority_id')}
+        tag_ids = {tag_id for item in items for tag_id in item.get('tags_ids') or []}
+
+        self.members = set()
+        if user_ids and scoped:
+            self.members |= set(ProjectMembers.objects.filter(
+                project_id__in=scoped, user_id__in=user_ids
+            ).values_list('project_id', 'user_id'))
+        if user_ids and None in project_ids:
+            self.members |= {(None, user_id) for user_id in User.objects.filter(
+                pk__in=user_ids
+            ).values_list('pk', flat=True)}
+
+        self.priorities = self._owners(Priority, priority_ids, project_ids)
+        self.tags = self._owners(Tag, tag_ids, project_ids)
+
+    @staticmethod
+    def _owners(model, ids, project_ids):
+        """{id: project_id} для найденных объектов"""
+        if not ids:
+            return {}
+        queryset = model.objects.filter(pk__in=ids)
+        if None not in project_ids:
+            queryset = queryset.filter(project_id__in=project_ids)
+        return dict(queryset.values_list('pk', 'project_id'))
+
+    @staticmethod
+    def _belongs(owners, pk, project_id):
+        return pk in owners and (project_id is None or owners[pk] == project_id)
+
+    def errors(self, item, project_id):
+        """Ошибки по полям для задачи item проекта project_id; пустой словарь — все в порядке"""
+        detail = {}
+        if item.get('assigned_to_id') and (project_id, item['assigned_to_id']) not in self.members:
+            detail['assigned_to_id'] = ['Пользователь не участник проекта']
+        if item.get('priority_id') and not self._belongs(self.priorities, item['priority_id'], project_id):
+            detail['priority_id'] = ['Приоритет не найден в проекте']
+        missing = [tag_id for tag_id in item.get('tags_ids') or [] if not self._belongs(self.tags, tag_id, project_id)]
+        if missing:
+            detail['tags_ids'] = [f'Теги не найдены в проекте: {", ".join(map(str, missing))}']
+        return detail
@@ -0,0 +1,192 @@
+"""
+Полнотекстовый поиск задач по названию, описанию, подзадачам и комментариям.
+
+Текст задачи хранится в TaskSearchDocument и обновляется сигналами
+(task/signals.py). Индекс над ним зависит от СУБД и создается миграцией:
+- SQLite: FTS5-таблица SQLITE_FTS_TABLE поверх представления с токеном
+  проекта, синхронизируется триггерами;
+- PostgreSQL: сохраняемая колонка POSTGRES_VECTOR_COLUMN с GIN-индексом.
+
+Ранжируются не все совпадения, а CANDIDATE_LIMIT самых новых из них:
+bm25 / ts_rank по сотням тысяч строк не укладывается во время ответа, а
+узкий запрос все равно дает меньше кандидатов. Подсветка считается только
+для выдачи.
+"""
+import html
+import re
+from collections import defaultdict
+
+from django.db import connection
+
+from .models import Subtask, Task, TaskSearchDocument
+
+MAX_TERMS = 10
+MIN_PREFIX_LENGTH = 3
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+CANDIDATE_LIMIT = 5000
+# До стольких проектов фильтр по проекту выполняет сам FTS-индекс
+PROJECT_FILTER_MAX = 20
+
+# Маркеры подсветки: управляющие символы не встречаются в тексте и
+# переживают экранирование HTML, после которого заменяются на <mark>
+START, STOP = '\x02', '\x03'
+
+DOCUMENT_TABLE = TaskSearchDocument._meta.db_table
+SQLITE_FTS_TABLE = 'task_search_fts'
+# Веса колонок FTS5 (project, title, body): название весит в 10 раз больше
+SQLITE_BM25 = f'bm25({SQLITE_FTS_TABLE}, 0.0, 10.0, 1.0)'
+POSTGRES_CONFIG = 'russian'
+POSTGRES_VECTOR_COLUMN = 'search_vector'
+
+
+def parse_terms(query):
+    """Слова запроса без операторов и спецсимволов поискового синтаксиса"""
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+def build_document(task_id):
+    """Обновляет поисковый текст задачи; удаляет его, если задача вне проекта"""
+    build_documents([task_id])
+
+
+def build_documents(task_ids):
+    """build_document() для пачки задач: четыре запроса на всю пачку"""
+    task_ids = set(task_ids)
+    if not task_ids:
+        return
+
+    tasks = Task.objects.filter(pk__in=task_ids, column__board__project_id__isnull=False).values_list(
+        'pk', 'title', 'description', 'column__board__project_id'
+    )
+    # Комментарии импортируются здесь: comment.models зависит от task.models
+    from comment.models import Comment
+    parts = defaultdict(list)
+    for task_id, text in Subtask.objects.filter(task_id__in=task_ids).values_list('task_id', 'title'):
+        parts[task_id].append(text)
+    for task_id, text in Comment.objects.filter(task_id__in=task_ids).values_list('task_id', 'content'):
+        parts[task_id].append(text)
+
+    documents = [
+        TaskSearchDocument(
+            task_id=task_id,
+            project_id=project_id,
+            title=title,
+            body='\n'.join(filter(None, [description or '', *parts[task_id]])),
+        )
+        for task_id, title, description, project_id in tasks
+    ]
+    TaskSearchDocument.objects.filter(task_id__in=task_ids - {document.task_id for document in documents}).delete()
+    TaskSearchDocument.objects.bulk_create(
+        documents, update_conflicts=True, unique_fields=['task'], update_fields=['project', 'title', 'body']
+    )
+
+
+def search_tasks(query, project_ids, limit=DEFAULT_LIMIT):
+    """
+    Лучшие совпадения среди задач проектов project_ids:
+    [{'task_id', 'score', 'title', 'snippet'}], score — чем больше, тем лучше.
+    """
+    terms = parse_terms(query)
+    project_ids = list(project_ids)
+    if not terms or not project_ids:
+        return []
+
+    if connection.vendor == 'postgresql':
+        rows = _search_postgres(terms, project_ids, limit)
+    else:
+        rows = _search_sqlite(terms, project_ids, limit)
+
+    return [
+        {'task_id': task_id, 'score': round(score, 4), 'title': _mark(title), 'snippet': _mark(snippet)}
+        for task_id, score, title, snippet in rows
+    ]
+
+
+def _is_prefix(index, terms):
+    # Префиксный поиск только для последнего слова (набор «на лету»):
+    # короткие префиксы раскрываются в тысячи слов
+    return index == len(terms) - 1 and len(terms[index]) >= MIN_PREFIX_LENGTH
+
+
+def _search_sqlite(terms, project_ids, limit):
+    match = ' '.join(
+        f'"{term}"*' if _is_prefix(index, terms) else f'"{term}"'
+        for index, term in enumerate(terms)
+    )
+
+    if len(project_ids) <= PROJECT_FILTER_MAX:
+        # Проекты — токены колонки project: FTS пересекает списки документов сам
+        projects = ' OR '.join(f'p{project_id}' for project_id in project_ids)
+        candidates = f'''
+            SELECT rowid AS task_id, {SQLITE_BM25} AS score
+            FROM {SQLITE_FTS_TABLE}
+            WHERE {SQLITE_FTS_TABLE} MATCH %s
+            ORDER BY rowid DESC LIMIT %s
+        '''
+        params = [f'project : ({projects}) AND ({match})', CANDIDATE_LIMIT]
+    else:
+        placeholders = ', '.join(['%s'] * len(project_ids))
+        candidates = f'''
+            SELECT {SQLITE_FTS_TABLE}.rowid AS task_id, {SQLITE_BM25} AS score
+            FROM {SQLITE_FTS_TABLE}
+            JOIN {DOCUMENT_TABLE} d ON d.task_id = {SQLITE_FTS_TABLE}.rowid
+            WHERE {SQLITE_FTS_TABLE} MATCH %s AND d.project_id IN ({placeholders})
+            ORDER BY {SQLITE_FTS_TABLE}.rowid DESC LIMIT %s
+        '''
+        params = [match, *project_ids, CANDIDATE_LIMIT]
+
+    with connection.cursor() as cursor:
+        # bm25 отрицателен: чем меньше, тем релевантнее
+        cursor.execute(f'SELECT task_id, score FROM ({candidates}) ORDER BY score LIMIT %s', [*params, limit])
+        scores = dict(cursor.fetchall())
+        if not scores:
+            return []
+
+        placeholders = ', '.join(['%s'] * len(scores))
+        cursor.execute(f'''
+            SELECT rowid, highlight({SQLITE_FTS_TABLE}, 1, %s, %s),
+                   snippet({SQLITE_FTS_TABLE}, 2, %s, %s, '…', 16)
+            FROM {SQLITE_FTS_TABLE}
+            WHERE {SQLITE_FTS_TABLE} MATCH %s AND rowid IN ({placeholders})
+        ''', [START, STOP, START, STOP, match, *scores])
+        highlights = {task_id: (title, snippet) for task_id, title, snippet in cursor.fetchall()}
+
+    return [(task_id, -score, *highlights.get(task_id, ('', ''))) for task_id, score in scores.items()]
+
+
+def _search_postgres(terms, project_ids, limit):
+    tsquery = ' & '.join(
+        f'{term}:*' if _is_prefix(index, terms) else term
+        for index, term in enumerate(terms)
+    )
+    options = f'StartSel={START}, StopSel={STOP}'
+    sql = f'''
+        SELECT d.task_id, top.score,
+               ts_headline(%s, d.title, top.query, %s),
+               ts_headline(%s, d.body, top.query, %s)
+        FROM (
+            SELECT task_id, ts_rank({POSTGRES_VECTOR_COLUMN}, query) AS score, query
+            FROM (
+                SELECT task_id, {POSTGRES_VECTOR_COLUMN}, query
+                FROM {DOCUMENT_TABLE}, to_tsquery(%s, %s) query
+                WHERE {POSTGRES_VECTOR_COLUMN} @@ query AND project_id = ANY(%s)
+                ORDER BY task_id DESC LIMIT %s
+            ) candidates
+            ORDER BY score DESC LIMIT %s
+        ) top
+        JOIN {DOCUMENT_TABLE} d ON d.task_id = top.task_id
+        ORDER BY top.score DESC
+    '''
+    params = [
+        POSTGRES_CONFIG, f'{options}, HighlightAll=true',
+        POSTGRES_CONFIG, f'{options}, MaxFragments=1, MaxWords=20, MinWords=5',
+        POSTGRES_CONFIG, tsquery, project_ids, CANDIDATE_LIMIT, limit,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _mark(text):
+    return html.escape(text or '').replace(START, '<mark>').replace(STOP, '</mark>')
@@ -1,40 +1,38 @@
 from rest_framework import serializers
-from .models import Task, Subtask
+from core.serializers import SparseFieldsMixin
+from .models import Task, Subtask, TimeEntry
+from .references import TaskReferences
+from .timetracking import format_duration
 from tag.serializers import TagSerializer
 from priority.serializers import PrioritySerializer
 from authentication.serializers import UserSerializer, UserRoleSerializer
 from report.serializers import ReportSerializer
 from comment.serializers import CommentSerializer
 
-from authentication.models import User
-from priority.models import Priority
-from tag.models import Tag
+from project.stats import project_id_for_column
 
 class SubtaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Subtask
-        fields = ['id', 'title', 'is_completed', 'order']
-
-class BaseTaskSerializer(serializers.ModelSerializer):
-    # Для записи (input) — принимаем ID
-    assigned_to_id = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.all(), 
-        source='assigned_to', 
-        required=False, 
-        allow_null=True,
-        write_only=True  # не отображается в выводе
-    )
-    priority_id = serializers.PrimaryKeyRelatedField(
-        queryset=Priority.objects.all(), 
-        source='priority', 
-        required=False, 
-        allow_null=True,
-        write_only=True
-    )
-    tags_ids = serializers.PrimaryKeyRelatedField(
-        queryset=Tag.objects.all(), 
-        source='tags', 
-        many=True, 
+        fields = ['id', 'title', 'is_completed', 'rank']
+        read_only_fields = ['rank']
+
+
+class SubtaskChangeSerializer(SubtaskSerializer):
+    """Подзадача в дельте доски — со ссылкой на задачу"""
+    task_id = serializers.IntegerField(read_only=True)
+
+    class Meta(SubtaskSerializer.Meta):
+        fields = SubtaskSerializer.Meta.fields + ['task_id']
+
+class BaseTaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    # Для записи (input) — принимаем ID. Связи проверяются в validate()
+    # пачкой и в пределах проекта задачи (task/references.py)
+    assigned_to_id = serializers.IntegerField(required=False, allow_null=True, write_only=True)
+    priority_id = serializers.IntegerField(required=False, allow_null=True, write_only=True)
+    tags_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        source='tags',
         required=False,
         write_only=True
     )
@@ -46,6 +44,8 @@ class BaseTaskSerializer(serializers.ModelSerializer):
     subtasks = SubtaskSerializer(many=True, read_only=True)
     report = ReportSerializer(read_only=True)  # отчет (OneToOne)
     comments = CommentSerializer(many=True, read_only=True)
+    # Учтенное время строкой ЧЧ:ММ:СС, как раньше отдавал TimeField
+    time = serializers.SerializerMethodField()
 
     class Meta:
         model = Task
@@ -55,9 +55,38 @@ class BaseTaskSerializer(serializers.ModelSerializer):
             'priority', 'priority_id', 'due_date',
             'created_at', 'updated_at', 'tags', 'tags_ids', 'subtasks',
             'assigned_at', 'started_at', 'submitted_at',
-            'completed_at', 'time', 'is_completed', 'order',
+            'completed_at', 'time', 'is_completed', 'rank',
             'report', 'comments'
         ]
+        read_only_fields = ['rank']
+
+    def get_time(self, obj):
+        return format_duration(obj.tracked_seconds) if obj.tracked_seconds else None
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        references = {
+            'assigned_to_id': attrs.get('assigned_to_id'),
+            'priority_id': attrs.get('priority_id'),
+            'tags_ids': attrs.get('tags'),
+        }
+        if not any(references.values()):
+            return attrs
+
+        project_id = self.get_project_id()
+        errors = TaskReferences([references], [project_id]).errors(references, project_id)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def get_project_id(self):
+        """Проект задачи: колонки из контекста (создание в колонке) или самой задачи"""
+        column = self.context.get('column')
+        if column is not None:
+            return column.board.project_id
+        if self.instance is not None and self.instance.column_id:
+            return project_id_for_column(self.instance.column_id)
+        return None
 
     def update(self, instance, validated_data):
         # Обрабатываем теги отдельно, так как они ManyToMany
@@ -69,6 +98,16 @@ class BaseTaskSerializer(serializers.ModelSerializer):
         
         return instance
 
+class TaskChangeSerializer(BaseTaskSerializer):
+    """Задача в дельте доски: подзадачи и комментарии приходят отдельными списками"""
+    column_id = serializers.IntegerField(read_only=True)
+
+    class Meta(BaseTaskSerializer.Meta):
+        fields = [
+            name for name in BaseTaskSerializer.Meta.fields
+            if name not in ('subtasks', 'comments')
+        ] + ['column_id']
+
 class TaskSerializer(BaseTaskSerializer):
     column = serializers.SerializerMethodField()
 
@@ -76,5 +115,64 @@ class TaskSerializer(BaseTaskSerializer):
         fields = BaseTaskSerializer.Meta.fields + ['column']
 
     def get_column(self, obj):
-        from column.serializers import ColumnSerializer
-        return ColumnSerializer(obj.column).data if obj.column else None
\ No newline at end of file
+        from column.serializers import ColumnSerializer, ColumnRefSerializer
+
+        if not obj.column:
+            return None
+
+        # Полная колонка со всеми задачами — только по явному ?expand=column
+        if 'column' in self.get_expand():
+            return ColumnSerializer(obj.column, context=self.context).data
+        return ColumnRefSerializer(obj.column).data
+
+    def get_expand(self):
+        request = self.context.get('request')
+        if request is None:
+            return set()
+        return set(filter(None, request.query_params.get('expand', '').split(',')))
+
+class MyTaskSerializer(serializers.ModelSerializer):
+    """Задача в списке «Мои задачи»: без подзадач и комментариев, но с колонкой и проектом"""
+    priority = PrioritySerializer(read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
+    column = serializers.SerializerMethodField()
+    project = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Task
+        fields = [
+            'id', 'title', 'priority', 'tags', 'due_date', 'is_completed',
+            'started_at', 'submitted_at', 'column', 'project',
+        ]
+
+    def get_column(self, obj):
+        from column.serializers import ColumnRefSerializer
+
+        return ColumnRefSerializer(obj.column).data
+
+    def get_project(self, obj):
+        project = obj.column.board.project
+        return {'id': project.pk, 'name': project.name, 'key': project.key}
+
+class BulkTaskSerializer(serializers.ModelSerializer):
+    """
+    Одна задача в пакетной операции (task/bulk.py). Связи приходят голыми id
+    и проверяются для всего пакета сразу — по запросу на модель.
+    """
+    id = serializers.IntegerField(required=False)
+    column_id = serializers.IntegerField(required=False)
+    assigned_to_id = serializers.IntegerField(required=False, allow_null=True)
+    priority_id = serializers.IntegerField(required=False, allow_null=True)
+    tags_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    class Meta:
+        model = Task
+        fields = [
+            'id', 'column_id', 'title', 'description', 'due_date', 'is_completed',
+            'assigned_to_id', 'priority_id', 'tags_ids',
+        ]
+
+class TimeEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TimeEntry
+        fields = ['id', 'task_id', 'user_id', 'project_id', 'started_at', 'ended_at', 'duration']
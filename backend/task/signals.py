@@ -0,0 +1,36 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from comment.models import Comment
+from .models import Task, Subtask
+from .search import build_document
+
+# Поля задачи, которые попадают в поисковый текст
+SEARCH_FIELDS = {'title', 'description', 'column'}
+
+
+def is_cascade(instance, origin):
+    """Объект удаляется вместе с задачей (или доской, проектом) — документ удалится сам"""
+    if origin is instance:
+        return False
+    return not (isinstance(origin, QuerySet) and origin.model is type(instance))
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or SEARCH_FIELDS & set(update_fields):
+        build_document(instance.pk)
+
+
+@receiver(post_save, sender=Subtask)
+@receiver(post_save, sender=Comment)
+def task_text_saved(sender, instance, **kwargs):
+    build_document(instance.task_id)
+
+
+@receiver(post_delete, sender=Subtask)
+@receiver(post_delete, sender=Comment)
+def task_text_deleted(sender, instance, origin=None, **kwargs):
+    if not is_cascade(instance, origin):
+        build_document(instance.task_id)
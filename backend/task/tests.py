@@ -0,0 +1,65 @@
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from authentication.models import User, UserRole
+
+from .query_plans import explain_hot_queries
+from .ranking import rank_between
+
+
+class HotQueryPlansTest(TestCase):
+    """Основные запросы идут по индексам, а не полным просмотром таблиц"""
+
+    def test_hot_queries_use_indexes(self):
+        for title, plan, uses_index in explain_hot_queries():
+            with self.subTest(query=title):
+                self.assertTrue(uses_index, f'{title} выполняется без индекса:\n{plan}')
+
+
+class RankingTest(SimpleTestCase):
+    """Добавления в начало и конец списка почти не удлиняют ранги"""
+
+    def test_appends_keep_ranks_short(self):
+        ranks = ['i']
+        for _ in range(1000):
+            ranks.append(rank_between(ranks[-1], None))
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertLessEqual(max(map(len, ranks)), 4)
+
+    def test_prepends_keep_ranks_short(self):
+        ranks = ['i']
+        for _ in range(1000):
+            ranks.insert(0, rank_between(None, ranks[0]))
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertLessEqual(max(map(len, ranks)), 4)
+
+    def test_ranks_do_not_end_with_zero(self):
+        for rank in ('z0z', '1', '01', 'j1'):
+            with self.subTest(rank=rank):
+                after, before = rank_between(rank, None), rank_between(None, rank)
+                self.assertTrue(before < rank < after)
+                self.assertFalse(after.endswith('0') or before.endswith('0'))
+
+
+class TimeEntryPeriodTest(TestCase):
+    """Период отчетов по времени задается корректными датами"""
+
+    @classmethod
+    def setUpTestData(cls):
+        UserRole.objects.create(id=2, name='Разработчик')
+        cls.user = User.objects.create_user(email='user@example.com', username='user', password='password')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_invalid_period_is_rejected(self):
+        for report in ('daily', 'weekly'):
+            for query in ('from=garbage', 'to=2024-13-01', 'from=2024-02-01&to=2024-01-01'):
+                with self.subTest(report=report, query=query):
+                    response = self.client.get(f'/api/v1/time-entries/{report}/?{query}')
+                    self.assertEqual(response.status_code, 400)
+
+    def test_valid_period(self):
+        response = self.client.get('/api/v1/time-entries/daily/?from=2024-01-01&to=2024-01-31')
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,91 @@
+"""
+Учет времени: таймер задачи — открытая запись TimeEntry.
+
+Старт и остановка выполняются под блокировкой строки задачи, итог задачи
+(tracked_seconds) увеличивается выражением F(), поэтому одновременные
+остановки не теряют время. Отчеты агрегируются базой одним запросом.
+"""
+from django.db import transaction
+from django.db.models import Count, DateField, F, Sum
+from django.db.models.functions import TruncDate, TruncWeek
+from django.utils import timezone
+
+from board.cache import bump_board_version
+from project import stats
+from .models import Task, TimeEntry
+
+
+def format_duration(seconds):
+    """ЧЧ:ММ:СС без переполнения после суток: 27 часов — '27:00:00'"""
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f'{hours:02d}:{minutes:02d}:{seconds:02d}'
+
+
+def toggle_timer(task_id, user):
+    """Запускает или останавливает таймер задачи; возвращает (задачу, запись)"""
+    with transaction.atomic():
+        task = Task.objects.select_for_update().select_related('column__board').get(pk=task_id)
+        if task.is_timer_running:
+            return task, stop_timer(task)
+        return task, start_timer(task, user)
+
+
+def start_timer(task, user):
+    now = timezone.now()
+    entry = TimeEntry.objects.create(task=task, user=user, project_id=task.column.board.project_id, started_at=now)
+
+    task.timer_started_at = now
+    task.is_timer_running = True
+    fields = ['timer_started_at', 'is_timer_running', 'updated_at']
+
+    # Первый запуск вообще
+    if not task.started_at:
+        task.started_at = now
+        task.assigned_at = now
+        task.assigned_to = user
+        fields += ['started_at', 'assigned_at', 'assigned_to']
+        stats.record(task.column.board.project_id, now, started=1)
+
+    task.save(update_fields=fields)
+    return entry
+
+
+def stop_timer(task):
+    now = timezone.now()
+    entry = TimeEntry.objects.select_for_update().filter(task=task, ended_at__isnull=True).first()
+    if entry is None:
+        # Таймер отмечен запущенным, но записи нет — восстанавливаем ее по задаче
+        entry = TimeEntry(task=task, project_id=task.column.board.project_id, started_at=task.timer_started_at or now)
+
+    entry.ended_at = now
+    entry.duration = max(int((now - entry.started_at).total_seconds()), 0)  # округляем до секунд
+    entry.save()
+
+    Task.objects.filter(pk=task.pk).update(
+        tracked_seconds=F('tracked_seconds') + entry.duration,
+        timer_started_at=None,
+        is_timer_running=False,
+        updated_at=now,
+    )
+    task.refresh_from_db(fields=['tracked_seconds', 'timer_started_at', 'is_timer_running', 'updated_at'])
+
+    stats.record(task.column.board.project_id, now, tracked_seconds=entry.duration)
+
+    # update() не отправляет сигналы — снимок доски сбрасываем сами
+    bump_board_version(task.column.board_id)
+    return entry
+
+
+def daily_totals(entries):
+    """Секунды по пользователям и дням (в часовом поясе TIME_ZONE)"""
+    return entries.filter(ended_at__isnull=False).annotate(day=TruncDate('started_at')).values(
+        'user_id', 'day'
+    ).annotate(seconds=Sum('duration'), entries=Count('pk')).order_by('day', 'user_id')
+
+
+def weekly_totals(entries):
+    """Секунды по проектам и неделям (неделя — дата ее понедельника)"""
+    return entries.filter(ended_at__isnull=False).annotate(week=TruncWeek('started_at', output_field=DateField())).values(
+        'project_id', 'week'
+    ).annotate(seconds=Sum('duration'), entries=Count('pk')).order_by('week', 'project_id')
@@ -1,23 +1,68 @@
-from rest_framework.viewsets import ModelViewSet
-from .models import Task, Subtask
-from .serializers import TaskSerializer, SubtaskSerializer
+from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
+from rest_framework.permissions import IsAuthenticated
+from core.pagination import MyTaskPagination, TaskPagination, TimeEntryPagination
+from .models import Task, Subtask, TimeEntry
+from .serializers import MyTaskSerializer, TaskSerializer, SubtaskSerializer, TimeEntrySerializer
+from .queries import with_due_order, with_task_details
+from .ranking import rank_between, rebalance, rerank
+from .bulk import BulkError, apply_bulk
+from .search import DEFAULT_LIMIT, MAX_LIMIT, search_tasks
+from .timetracking import daily_totals, format_duration, toggle_timer, weekly_totals
+from board import events
+from board.cache import bump_board_version, get_board_versions
+from board.events import send_board_event, task_delta
+from core.etag import ConditionalGetMixin
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
 from column.models import Column
+from column.serializers import ColumnRefSerializer
+from project import stats
+from project.membership import get_request_memberships
+from project.permissions import ProjectScopedMixin
 from report.models import Report
 from comment.models import Comment
 from django.db import transaction
+from django.db.models import Count, Max
 from comment.serializers import CommentSerializer
 from report.serializers import ReportSerializer
 from django.utils import timezone  # Для текущего времени с учетом временной зоны
+from collections import Counter
+from django.utils.dateparse import parse_date
 from datetime import timedelta, datetime  # Для работы с промежутками времени
 from decimal import Decimal
 
-class TaskViewSet(ModelViewSet):
+class TaskViewSet(ProjectScopedMixin, ConditionalGetMixin, ModelViewSet):
+    project_lookup = 'column__board__project_id'
     serializer_class = TaskSerializer
+    pagination_class = TaskPagination
     queryset = Task.objects.all()
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action in ('list', 'retrieve'):
+            queryset = with_task_details(queryset.select_related('column'))
+
+        return queryset
+
+    def get_list_fingerprint(self):
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        stats = queryset.aggregate(last_update=Max('updated_at'), total=Count('pk'))
+        board_ids = queryset.values_list('column__board_id', flat=True).distinct()
+        # Комментарии, подзадачи, отчеты и теги не трогают updated_at задачи,
+        # но меняют версию ее доски
+        return stats, sorted(get_board_versions(board_ids).items())
+
+    def get_object_fingerprint(self):
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        task = self.filter_queryset(self.scope_to_projects(Task.objects.all(), self.project_lookup))
+        task = task.filter(**{self.lookup_field: lookup})
+        task = task.values('updated_at', 'column__board_id').first()
+        if task is None:
+            raise NotFound()
+        return task['updated_at'], get_board_versions([task['column__board_id']])
 
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
@@ -28,6 +73,8 @@ class TaskViewSet(ModelViewSet):
 
         # Проверяем: был ли assigned_to пустым и пришёл в запросе
         was_unassigned = instance.assigned_to is None
+        was_completed = instance.is_completed
+        previous_column_id = instance.column_id
         new_assignee = request.data.get('assigned_to') or request.data.get('assigned_to_id')
 
         self.perform_update(serializer)
@@ -36,25 +83,150 @@ class TaskViewSet(ModelViewSet):
             instance.assigned_at = timezone.now()
             instance.save(update_fields=["assigned_at"])
 
+        project_id = stats.project_id_for_column(instance.column_id)
+        # Выполнение учитывается один раз, как в stats.rebuild: по первому completed_at
+        if instance.is_completed and not was_completed and instance.completed_at is None:
+            instance.completed_at = timezone.now()
+            instance.save(update_fields=["completed_at"])
+            stats.record(project_id, completed=1)
+        stats.move_open_task(
+            None if was_completed else previous_column_id,
+            None if instance.is_completed else instance.column_id,
+        )
+
+        send_board_event(self.get_board_id(instance.column_id), events.TASK_UPDATED, task_delta(instance))
+
         return Response(serializer.data)
 
+    def perform_create(self, serializer):
+        task = serializer.save()
+        stats.record(
+            stats.project_id_for_column(task.column_id), created=1,
+            open_tasks=None if task.is_completed else {task.column_id: 1},
+        )
+
+    def perform_destroy(self, instance):
+        board_id = self.get_board_id(instance.column_id)
+        task_id = instance.pk
+        instance.delete()
+        if not instance.is_completed:
+            stats.move_open_task(from_column_id=instance.column_id)
+        send_board_event(board_id, events.TASK_DELETED, {'id': task_id})
+
+    def get_member_columns(self):
+        """Колонки проектов пользователя: в чужую колонку задачу не создать и не перенести"""
+        return self.scope_to_projects(Column.objects.all(), 'board__project_id')
+
+    def get_board_id(self, column_id):
+        return Column.objects.filter(pk=column_id).values_list('board_id', flat=True).first()
+
+    @action(detail=False, methods=['GET'])
+    def search(self, request):
+        """Полнотекстовый поиск ?q= по задачам проектов пользователя"""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "q is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = min(int(request.query_params.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        project_ids = list(get_request_memberships(request))
+        matches = search_tasks(query, project_ids, max(limit, 1))
+
+        tasks = Task.objects.select_related('column').in_bulk([match['task_id'] for match in matches])
+        results = []
+        for match in matches:
+            task = tasks.get(match['task_id'])
+            if task is None:
+                continue
+            results.append({
+                'id': task.pk,
+                'title': task.title,
+                'is_completed': task.is_completed,
+                'column': ColumnRefSerializer(task.column).data if task.column else None,
+                'score': match['score'],
+                'highlight': {'title': match['title'], 'snippet': match['snippet']},
+            })
+        return Response({'results': results})
+
+    @action(detail=False, methods=['GET'])
+    def mine(self, request):
+        """
+        Задачи текущего пользователя во всех его проектах по сроку и приоритету.
+        Фильтры: ?is_completed=true|false, ?due_from= и ?due_to= (ГГГГ-ММ-ДД), ?project=
+        """
+        columns = Column.objects.filter(board__project_id__in=list(get_request_memberships(request)))
+        project_id = request.query_params.get('project')
+        if project_id:
+            if not project_id.isdigit():
+                raise ValidationError({"error": "project must be an integer"})
+            columns = columns.filter(board__project_id=project_id)
+
+        # Задачи исполнителя читаются из индекса task_assignee_due_idx и сортируются
+        # в памяти; строки задач загружаются только для страницы
+        tasks = with_due_order(Task.objects.filter(
+            assigned_to=request.user, column_id__in=columns.values('pk'),
+        ).only('id'))
+
+        is_completed = request.query_params.get('is_completed')
+        if is_completed is not None:
+            if is_completed not in ('true', 'false'):
+                raise ValidationError({"error": "is_completed must be true or false"})
+            tasks = tasks.filter(is_completed=is_completed == 'true')
+
+        for param, lookup in (('due_from', 'due_date__gte'), ('due_to', 'due_date__lte')):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                day = parse_date(value)
+            except ValueError:
+                day = None
+            if day is None:
+                raise ValidationError({"error": f"{param} must be a date"})
+            tasks = tasks.filter(**{lookup: day})
+
+        paginator = MyTaskPagination()
+        page = paginator.paginate_queryset(tasks, request, view=self)
+        details = Task.objects.select_related('priority', 'column__board__project').prefetch_related('tags')
+        details = details.in_bulk([task.pk for task in page])
+        serializer = MyTaskSerializer([details[task.pk] for task in page], many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['POST'])
+    def bulk(self, request):
+        """Пакетное создание, изменение и удаление задач (см. task/bulk.py)"""
+        try:
+            result = apply_bulk(request.user, request.data)
+        except BulkError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['POST'], url_path='add-task-to-column/(?P<column_id>[^/.]+)')
     def add_task_to_column(self, request, column_id=None):
         try:
-            column = Column.objects.get(pk=column_id)
+            column = self.get_member_columns().select_related('board').get(pk=column_id)
         except Column.DoesNotExist:
             return Response(
                 {"error": "Column not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Определяем порядок для новой задачи
-        last_order = Task.objects.filter(column=column).order_by('-order').first()
-        new_order = (last_order.order + 1) if last_order else 0
+        # Новая задача встает в конец колонки
+        last_rank = Task.objects.filter(column=column).aggregate(last=Max('rank'))['last']
+        new_rank = rank_between(last_rank, None)
 
-        serializer = self.get_serializer(data=request.data)
+        # Колонка в контексте: связи задачи проверяются в пределах ее проекта
+        serializer = self.get_serializer(data=request.data, context={**self.get_serializer_context(), 'column': column})
         if serializer.is_valid():
-            serializer.save(column=column, order=new_order)
+            task = serializer.save(column=column, rank=new_rank)
+            stats.record(
+                stats.project_id_for_column(column.pk), created=1,
+                open_tasks=None if task.is_completed else {column.pk: 1},
+            )
+            send_board_event(column.board_id, events.TASK_CREATED, task_delta(task))
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
@@ -62,7 +234,7 @@ class TaskViewSet(ModelViewSet):
     def update_task_column(self, request, pk=None):
         task = self.get_object()
         new_column_id = request.data.get('column_id')
-        new_order = request.data.get('order')  # <- тут
+        new_order = request.data.get('order')  # позиция в новой колонке
 
         if not new_column_id:
             return Response(
@@ -70,28 +242,68 @@ class TaskViewSet(ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        if new_order is not None:
+            try:
+                new_order = int(new_order)
+            except (TypeError, ValueError):
+                return Response(
+                    {"error": "order must be an integer"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
         try:
-            new_column = Column.objects.get(pk=new_column_id)
+            new_column = self.get_member_columns().get(pk=new_column_id)
         except Column.DoesNotExist:
             return Response(
                 {"error": "Column not found"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        if new_order is None:
-            last_order = Task.objects.filter(column=new_column).order_by('-order').first()
-            new_order = (last_order.order + 1) if last_order else 0
+        # Ранг между соседями на новой позиции — меняется только эта задача
+        siblings = Task.objects.filter(column=new_column).exclude(pk=task.pk)
+        try:
+            task.rank = self.rank_at_position(siblings, new_order)
+        except ValueError:
+            # Совпавшие ранги соседей: пересчитываем колонку и пробуем снова
+            rebalance(siblings)
+            task.rank = self.rank_at_position(siblings, new_order)
 
+        previous_column_id = task.column_id
         task.column = new_column
-        task.order = new_order
-        task.save()
+        task.save(update_fields=['column', 'rank', 'updated_at'])
+
+        if not task.is_completed:
+            stats.move_open_task(previous_column_id, new_column.pk)
+
+        previous_board_id = self.get_board_id(previous_column_id)
+        if previous_board_id not in (None, new_column.board_id):
+            send_board_event(previous_board_id, events.TASK_DELETED, {'id': task.pk})
+        send_board_event(
+            new_column.board_id,
+            events.TASK_MOVED,
+            dict(task_delta(task), from_column_id=previous_column_id)
+        )
 
         return Response(self.get_serializer(task).data)
 
+    def rank_at_position(self, siblings, position):
+        ranks = siblings.order_by('rank', 'id').values_list('rank', flat=True)
+        if position is None:
+            return rank_between(ranks.aggregate(last=Max('rank'))['last'], None)
+
+        position = max(position, 0)
+        if position == 0:
+            return rank_between(None, ranks.first())
+
+        neighbours = list(ranks[position - 1:position + 1])
+        if not neighbours:
+            return rank_between(ranks.aggregate(last=Max('rank'))['last'], None)
+        return rank_between(neighbours[0], neighbours[1] if len(neighbours) > 1 else None)
+
     @action(detail=False, methods=['POST'], url_path='update-column-order/(?P<column_id>[^/.]+)')
     def update_column_order(self, request, column_id=None):
         try:
-            column = Column.objects.get(pk=column_id)
+            column = self.get_member_columns().get(pk=column_id)
         except Column.DoesNotExist:
             return Response(
                 {"error": "Column not found"},
@@ -106,18 +318,40 @@ class TaskViewSet(ModelViewSet):
             )
 
         try:
+            # Чтение рангов и запись в одной транзакции: параллельная перестановка
+            # не перезапишет ее результат устаревшими рангами
             with transaction.atomic():
-                # Обновляем порядок всех задач в колонке
-                tasks = Task.objects.filter(id__in=task_order, column=column)
+                # Задачи из других колонок той же доски переносятся в эту колонку
+                tasks = Task.objects.filter(id__in=task_order, column__board_id=column.board_id).only('id', 'column', 'rank', 'is_completed')
                 task_dict = {str(task.id): task for task in tasks}
-                
-                for order, task_id in enumerate(task_order):
-                    task = task_dict.get(str(task_id))
-                    if task:
-                        task.order = order
-                        task.save(update_fields=['order'])
-            
-            return Response({"status": "order updated"})
+                ordered = [task_dict[str(task_id)] for task_id in task_order if str(task_id) in task_dict]
+                now = timezone.now()
+
+                # Ранги меняются только у перемещенных задач; пришедшие из других колонок
+                # считаются перемещенными всегда
+                changed = []
+                open_tasks = Counter()
+                for task, rank in rerank(ordered, lambda task: task.rank if task.column_id == column.id else None):
+                    if task.column_id != column.id and not task.is_completed:
+                        open_tasks[task.column_id] -= 1
+                        open_tasks[column.id] += 1
+                    task.rank = rank
+                    task.column_id = column.id
+                    task.updated_at = now  # bulk_update не обновляет auto_now
+                    changed.append(task)
+
+                # Один UPDATE ... CASE вместо отдельного save() на каждую задачу
+                Task.objects.bulk_update(changed, ['rank', 'column', 'updated_at'])
+
+            # bulk_update не отправляет сигналы — сбрасываем снимок доски сами
+            bump_board_version(column.board_id)
+            stats.record(stats.project_id_for_column(column.pk), open_tasks=open_tasks)
+            send_board_event(column.board_id, events.TASKS_REORDERED, {
+                'column_id': column.id,
+                'tasks': [{'id': task.pk, 'rank': task.rank} for task in changed],
+            })
+
+            return Response({"status": "order updated", "updated": len(changed)})
         except Exception as e:
             return Response(
                 {"error": str(e)},
@@ -132,9 +366,8 @@ class TaskViewSet(ModelViewSet):
         data = request.data.copy()
         data['task'] = task.id  # Явно указываем ID задачи
 
-        # Определяем порядок для новой подзадачи
-        last_order = Subtask.objects.filter(task=task).order_by('-order').first()
-        data['order'] = (last_order.order + 1) if last_order else 0
+        # Новая подзадача встает в конец списка
+        last_rank = Subtask.objects.filter(task=task).aggregate(last=Max('rank'))['last']
 
         # Создаем сериализатор с контекстом
         serializer = SubtaskSerializer(
@@ -144,7 +377,7 @@ class TaskViewSet(ModelViewSet):
         
         if serializer.is_valid():
             # Сохраняем, явно указывая задачу
-            serializer.save(task=task)
+            serializer.save(task=task, rank=rank_between(last_rank, None))
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -195,10 +428,30 @@ class TaskViewSet(ModelViewSet):
 
             # Если комментарий содержит одобрение, помечаем задачу как выполненную
             if getattr(comment, 'is_approved', False):  # если есть поле и оно True
-                task.completed_at = timezone.now()
+                first_completion = task.completed_at is None
+                was_open = not task.is_completed
+                if first_completion:
+                    task.completed_at = timezone.now()
                 task.is_completed = True
                 task.save(update_fields=["completed_at", "is_completed"])
 
+                stats.record(
+                    stats.project_id_for_column(task.column_id), completed=int(first_completion),
+                    open_tasks={task.column_id: -1} if was_open else None,
+                )
+
+            board_id = self.get_board_id(task.column_id)
+            send_board_event(board_id, events.COMMENT_ADDED, {
+                'id': comment.pk,
+                'task_id': task.pk,
+                'author_id': comment.author_id,
+                'content': comment.content,
+                'is_approved': comment.is_approved,
+                'created_at': comment.created_at.isoformat(),
+            })
+            if comment.is_approved:
+                send_board_event(board_id, events.TASK_UPDATED, task_delta(task))
+
             return Response(CommentSerializer(comment).data, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['POST', 'PUT'], url_path='update-report')
@@ -239,8 +492,11 @@ class TaskViewSet(ModelViewSet):
                     report.file = request.FILES['file']
                 report.save()
 
-                task.submitted_at = timezone.now()
-                task.save(update_fields=["submitted_at"])
+                # Повторное сохранение отчета — не новая отправка на проверку
+                if task.submitted_at is None:
+                    task.submitted_at = timezone.now()
+                    task.save(update_fields=["submitted_at"])
+                    stats.record(stats.project_id_for_column(task.column_id), submitted=1)
                 
                 return Response(serializer.data)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -254,55 +510,130 @@ class TaskViewSet(ModelViewSet):
         current_user = request.user
 
         try:
-            if not task.is_timer_running:
-                # ▶️ Запуск таймера
-                task.timer_started_at = timezone.now()  # новое поле
-                task.is_timer_running = True
-
-                # Первый запуск вообще
-                if not task.started_at:
-                    task.started_at = timezone.now()
-                    task.assigned_at = timezone.now()
-                    task.assigned_to = current_user
-
-                task.save()
+            # Старт и остановка атомарны: двойной клик не запустит таймер дважды,
+            # одновременные остановки не потеряют время
+            task, entry = toggle_timer(task.pk, current_user)
+            board_id = task.column.board_id
+
+            if entry.ended_at is None:
+                # ▶️ Таймер запущен
+                send_board_event(board_id, events.TIMER_STARTED, {
+                    'task_id': task.pk,
+                    'user_id': current_user.pk,
+                    'timer_started_at': task.timer_started_at.isoformat(),
+                })
 
                 return Response({
                     'status': 'timer_started',
                     'started_at': task.started_at,
-                    'total_time': task.time.strftime('%H:%M:%S') if task.time else '00:00:00'
+                    'total_time': format_duration(task.tracked_seconds)
                 })
 
-            else:
-                # ⏸ Остановка таймера
-                time_spent = timezone.now() - task.timer_started_at
-                time_spent = timedelta(seconds=int(time_spent.total_seconds()))  # ⏱️ округляем до секунд
+            # ⏸ Таймер остановлен
+            time_spent = str(timedelta(seconds=entry.duration))
+            total_time = format_duration(task.tracked_seconds)
 
-                # Суммируем с уже существующим временем (если оно есть)
-                total_delta = timedelta()
-                if task.time:
-                    total_delta = timedelta(
-                        hours=task.time.hour,
-                        minutes=task.time.minute,
-                        seconds=task.time.second
-                    )
+            send_board_event(board_id, events.TIMER_STOPPED, {
+                'task_id': task.pk,
+                'user_id': current_user.pk,
+                'time_spent': time_spent,
+                'total_time': total_time,
+            })
 
-                total_delta += time_spent
-
-                # Убираем микросекунды из окончательного времени
-                total_time = (datetime.min + total_delta).replace(microsecond=0).time()
-
-                task.time = total_time
-                task.timer_started_at = None
-                task.is_timer_running = False
-                task.save()
-
-                return Response({
-                    'status': 'timer_stopped',
-                    'time_spent': str(time_spent),
-                    'total_time': total_time.strftime('%H:%M:%S')
-                })
+            return Response({
+                'status': 'timer_stopped',
+                'time_spent': time_spent,
+                'total_time': total_time
+            })
 
         except Exception as e:
             return Response({'error': str(e)}, status=500)
-        
+
+
+class TimeEntryViewSet(ReadOnlyModelViewSet):
+    """Записи учета времени текущего пользователя и отчеты по ним"""
+    serializer_class = TimeEntrySerializer
+    pagination_class = TimeEntryPagination
+    permission_classes = [IsAuthenticated]
+    queryset = TimeEntry.objects.all()
+
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(user=self.request.user)
+
+        task_id = self.get_id_param('task')
+        if task_id is not None:
+            queryset = queryset.filter(task_id=task_id)
+
+        return queryset
+
+    def get_id_param(self, name):
+        """Числовой id из ?name= или None, если параметр не передан"""
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        if not value.isdigit():
+            raise ValidationError({"error": f"{name} must be an integer"})
+        return int(value)
+
+    def get_member_project_param(self):
+        """?project= из проектов пользователя; чужой или несуществующий — 404"""
+        project_id = self.get_id_param('project')
+        if project_id is not None and project_id not in get_request_memberships(self.request):
+            raise NotFound()
+        return project_id
+
+    @action(detail=False, methods=['GET'])
+    def daily(self, request):
+        """Время по пользователям и дням: свое или, с ?project=, всех участников проекта"""
+        entries = self.get_period_entries(request, default_days=30)
+
+        project_id = self.get_member_project_param()
+        if project_id is not None:
+            entries = entries.filter(project_id=project_id)
+        else:
+            entries = entries.filter(user=request.user)
+
+        return Response([
+            {**row, 'time': format_duration(row['seconds'])} for row in daily_totals(entries)
+        ])
+
+    @action(detail=False, methods=['GET'])
+    def weekly(self, request):
+        """Время по проектам пользователя и неделям; ?project= — один проект"""
+        entries = self.get_period_entries(request, default_days=12 * 7)
+
+        project_id = self.get_member_project_param()
+        if project_id is not None:
+            entries = entries.filter(project_id=project_id)
+        else:
+            entries = entries.filter(project_id__in=list(get_request_memberships(request)))
+
+        return Response([
+            {**row, 'time': format_duration(row['seconds'])} for row in weekly_totals(entries)
+        ])
+
+    def get_period_entries(self, request, default_days):
+        # ?from=ГГГГ-ММ-ДД&to=ГГГГ-ММ-ДД включительно; фильтр по started_at
+        # диапазоном, а не по дате, чтобы работал индекс
+        today = timezone.localdate()
+        date_from = self.get_date_param('from') or today - timedelta(days=default_days - 1)
+        date_to = self.get_date_param('to') or today
+        if date_from > date_to:
+            raise ValidationError({"error": "from must not be later than to"})
+
+        start = timezone.make_aware(datetime.combine(date_from, datetime.min.time()))
+        end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), datetime.min.time()))
+        return TimeEntry.objects.filter(started_at__gte=start, started_at__lt=end)
+
+    def get_date_param(self, name):
+        """Дата из ?name=ГГГГ-ММ-ДД или None, если параметр не передан"""
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise ValidationError({"error": f"{name} must be a date"})
+        return day